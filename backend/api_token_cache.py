@@ -0,0 +1,59 @@
+"""
+Admin bearer token cache for the local debug scripts.
+Reuses the last login's JWT until shortly before it expires, so repeated runs
+skip the login (and its server-side bcrypt verify).
+"""
+import base64
+import json
+import os
+import time
+
+TOKEN_CACHE_PATH = os.path.expanduser("~/.cmdb_admin_token.json")
+# Log in again when the cached token expires within this many seconds
+EXPIRY_MARGIN = 60
+
+def _token_exp(token):
+    """Read the 'exp' claim from a JWT without verifying it."""
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0)
+
+def get_cached_token(session, api_url, username, password, path=TOKEN_CACHE_PATH):
+    """Return a cached access token if it is still valid, else log in and cache the new one."""
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        if cached.get("api_url") == api_url and cached.get("exp", 0) - time.time() > EXPIRY_MARGIN:
+            return cached["access_token"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    response = session.post(f"{api_url}/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    token = response.json()["access_token"]
+
+    # Created owner-only so the token is never readable by others, not even briefly;
+    # fchmod also tightens a cache file left behind with wider permissions
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({"api_url": api_url, "access_token": token, "exp": _token_exp(token)}, f)
+    return token
+
+def invalidate_cached_token(path=TOKEN_CACHE_PATH):
+    """Drop the cached token, e.g. after the API answered 401."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def admin_get(session, api_url, path, username, password, cache_path=TOKEN_CACHE_PATH):
+    """GET an API path with the cached admin token; on 401 the cache is dropped and the login retried once."""
+    token = get_cached_token(session, api_url, username, password, cache_path)
+    response = session.get(f"{api_url}{path}", headers={"Authorization": f"Bearer {token}"})
+    if response.status_code == 401:
+        # Cached token was revoked or the secret changed
+        invalidate_cached_token(cache_path)
+        token = get_cached_token(session, api_url, username, password, cache_path)
+        response = session.get(f"{api_url}{path}", headers={"Authorization": f"Bearer {token}"})
+    return response
@@ -3,16 +3,40 @@ Configuration Item CRUD routes.
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import or_, func, cast, String
 from app.core.auth import get_current_user, require_role
 from app.db.database import get_db
-from app.db.models import ConfigurationItem, User, UserRole, CIType, CIStatus, SoftwareCatalog
+from app.db.models import ConfigurationItem, Relationship, User, UserRole, CIType, CIStatus, SoftwareCatalog
 from app.schemas import CICreate, CIUpdate, CIResponse, CIListResponse
 
 router = APIRouter(prefix="/api/ci", tags=["Configuration Items"])
 
 
+def ci_response_options():
+    """Loader options for queries serialized as CIResponse (software + relationships_summary)."""
+    return (
+        joinedload(ConfigurationItem.software),
+        selectinload(ConfigurationItem.source_relationships)
+            .joinedload(Relationship.target_ci)
+            .load_only(ConfigurationItem.name),
+        selectinload(ConfigurationItem.target_relationships)
+            .joinedload(Relationship.source_ci)
+            .load_only(ConfigurationItem.name),
+    )
+
+
+def load_ci_response(db: Session, ci_id: int) -> ConfigurationItem:
+    """
+    Re-select a CI with ci_response_options() after a write, so the response carries
+    relationships_summary; db.refresh() only reloads the columns.
+    """
+    return db.query(ConfigurationItem).options(*ci_response_options()).populate_existing().filter(
+        ConfigurationItem.id == ci_id
+    ).one()
+
+
 @router.get("", response_model=CIListResponse)
 def list_configuration_items(
     page: int = Query(1, ge=1),
@@ -37,15 +61,7 @@ def list_configuration_items(
     current_user: User = Depends(get_current_user)
 ):
     """List configuration items with pagination and filters."""
-    from sqlalchemy.orm import joinedload
-    # query = db.query(ConfigurationItem).options(
-    #     joinedload(ConfigurationItem.software),
-    #     joinedload(ConfigurationItem.source_relationships).joinedload(Relationship.target_ci),
-    #     joinedload(ConfigurationItem.target_relationships).joinedload(Relationship.source_ci)
-    # ).filter(ConfigurationItem.deleted_at.is_(None))
-    
-    # Revert to simpler query to test if join is causing issues
-    query = db.query(ConfigurationItem).options(joinedload(ConfigurationItem.software)).filter(ConfigurationItem.deleted_at.is_(None))
+    query = db.query(ConfigurationItem).filter(ConfigurationItem.deleted_at.is_(None))
     
     # Apply filters
     if ci_type:
@@ -170,14 +186,17 @@ def list_configuration_items(
     
     # Apply pagination
     offset = (page - 1) * page_size
-    items = query.offset(offset).limit(page_size).all()
+    items = query.options(*ci_response_options()).offset(offset).limit(page_size).all()
     
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "page_size": page_size
-    }
+    # Rows come straight from the database, so skip re-validating every field;
+    # returning a Response also keeps FastAPI from validating the payload again
+    response = CIListResponse.model_construct(
+        items=[CIResponse.from_trusted(ci) for ci in items],
+        total=total,
+        page=page,
+        page_size=page_size
+    )
+    return ORJSONResponse(response.model_dump(mode="json"))
 
 
 @router.get("/{ci_id}", response_model=CIResponse)
@@ -187,8 +206,7 @@ def get_configuration_item(
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific configuration item by ID."""
-    from sqlalchemy.orm import joinedload
-    ci = db.query(ConfigurationItem).options(joinedload(ConfigurationItem.software)).filter(
+    ci = db.query(ConfigurationItem).options(*ci_response_options()).filter(
         ConfigurationItem.id == ci_id,
         ConfigurationItem.deleted_at.is_(None)
     ).first()
@@ -212,10 +230,11 @@ def create_configuration_item(
     new_ci = ConfigurationItem(**ci_data.model_dump())
     
     db.add(new_ci)
+    db.flush()
+    new_id = new_ci.id  # Read before the commit expires it
     db.commit()
-    db.refresh(new_ci)
     
-    return new_ci
+    return load_ci_response(db, new_id)
 
 
 @router.put("/{ci_id}", response_model=CIResponse)
@@ -243,9 +262,8 @@ def update_configuration_item(
         setattr(ci, field, value)
     
     db.commit()
-    db.refresh(ci)
     
-    return ci
+    return load_ci_response(db, ci_id)
 
 
 @router.delete("/{ci_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -9,6 +9,7 @@ from app.core.auth import get_current_user
 from app.db.database import get_db
 from app.db.models import ConfigurationItem, User, CIStatus, CIType, ImportLog, CostRule, SoftwareCatalog, SoftwareCategory
 from app.schemas import DashboardStats, CIResponse
+from app.api.routes.ci_routes import ci_response_options
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
@@ -45,22 +46,22 @@ def get_dashboard_stats(
     current_user: User = Depends(get_current_user)
 ):
     """Get dashboard statistics."""
-    # Total CIs
-    total_cis = db.query(ConfigurationItem).filter(
+    # CIs by status; total/active/inactive are derived from it instead of separate count scans
+    cis_by_status_query = db.query(
+        ConfigurationItem.status,
+        func.count(ConfigurationItem.id)
+    ).filter(
         ConfigurationItem.deleted_at.is_(None)
-    ).count()
-    
-    # Active CIs
-    active_cis = db.query(ConfigurationItem).filter(
-        ConfigurationItem.deleted_at.is_(None),
-        ConfigurationItem.status == CIStatus.ACTIVE
-    ).count()
+    ).group_by(ConfigurationItem.status).all()
     
-    # Inactive CIs
-    inactive_cis = db.query(ConfigurationItem).filter(
-        ConfigurationItem.deleted_at.is_(None),
-        ConfigurationItem.status == CIStatus.INACTIVE
-    ).count()
+    cis_by_status = {}
+    for status, count in cis_by_status_query:
+        key = status.value if hasattr(status, 'value') else str(status)
+        cis_by_status[key] = count
+
+    total_cis = sum(cis_by_status.values())
+    active_cis = cis_by_status.get(CIStatus.ACTIVE.value, 0)
+    inactive_cis = cis_by_status.get(CIStatus.INACTIVE.value, 0)
     
     # CIs by type
     cis_by_type_query = db.query(
@@ -76,19 +77,6 @@ def get_dashboard_stats(
         key = ci_type.value if hasattr(ci_type, 'value') else str(ci_type)
         cis_by_type[key] = count
     
-    # CIs by status
-    cis_by_status_query = db.query(
-        ConfigurationItem.status,
-        func.count(ConfigurationItem.id)
-    ).filter(
-        ConfigurationItem.deleted_at.is_(None)
-    ).group_by(ConfigurationItem.status).all()
-    
-    cis_by_status = {}
-    for status, count in cis_by_status_query:
-        key = status.value if hasattr(status, 'value') else str(status)
-        cis_by_status[key] = count
-    
     # Recent imports (last 7 days)
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
     recent_imports = db.query(ImportLog).filter(
@@ -325,7 +313,7 @@ def get_recent_cis(
     current_user: User = Depends(get_current_user)
 ):
     """Get recently added or modified CIs."""
-    recent_cis = db.query(ConfigurationItem).filter(
+    recent_cis = db.query(ConfigurationItem).options(*ci_response_options()).filter(
         ConfigurationItem.deleted_at.is_(None)
     ).order_by(
         ConfigurationItem.updated_at.desc().nullslast(),
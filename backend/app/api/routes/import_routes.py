@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 import os
+import json
 import tempfile
 from app.core.auth import get_current_user, require_role
 from app.db.database import get_db
@@ -18,6 +19,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/import", tags=["Import"])
 
+# Bytes read per step when saving uploaded source files
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @router.post("/csv", response_model=ImportLogResponse)
 async def import_csv(
@@ -80,9 +84,10 @@ async def upload_source_file(
     file_path = os.path.join(upload_dir, safe_filename)
     
     try:
+        # Copy in chunks so large uploads are never held in memory at once
         with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
             
         return {"file_path": file_path, "filename": file.filename}
         
@@ -146,7 +151,7 @@ def list_sources(
             "id": source.id,
             "name": source.name,
             "source_type": source.source_type,
-            "config": source.config if isinstance(source.config, str) else str(source.config),
+            "config": source.config if source.config is None or isinstance(source.config, str) else json.dumps(source.config),
             "is_active": source.is_active,
             "schedule_cron": source.schedule_cron,
             "last_run": source.last_run.isoformat() if source.last_run else None,
@@ -3,8 +3,9 @@ CI Relationship routes.
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import or_, func, select
 
 from app.core.auth import get_current_user, require_role
 from app.db.database import get_db
@@ -28,23 +29,28 @@ def get_all_relationships_detailed(
     current_user: User = Depends(get_current_user)
 ):
     """Get all relationships with source and target CI names."""
-    relationships = db.query(Relationship).all()
-    
-    # Enrich with names (could be optimized with joins, but this is simpler for now given SQLAlchemy relationship setup)
-    detailed = []
-    for r in relationships:
-        detailed.append({
-            "id": r.id,
-            "source_ci_id": r.source_ci_id,
-            "target_ci_id": r.target_ci_id,
-            "relationship_type": r.relationship_type,
-            "description": r.description,
-            "created_at": r.created_at,
-            "source_ci_name": r.source_ci.name if r.source_ci else "Unknown",
-            "target_ci_name": r.target_ci.name if r.target_ci else "Unknown"
-        })
-        
-    return detailed
+    # One query with both CI names joined in, instead of two lazy loads per relationship
+    source_ci = aliased(ConfigurationItem)
+    target_ci = aliased(ConfigurationItem)
+    rows = db.execute(
+        select(
+            Relationship.id,
+            Relationship.source_ci_id,
+            Relationship.target_ci_id,
+            Relationship.relationship_type,
+            Relationship.description,
+            Relationship.created_at,
+            func.coalesce(source_ci.name, "Unknown").label("source_ci_name"),
+            func.coalesce(target_ci.name, "Unknown").label("target_ci_name")
+        )
+        .outerjoin(source_ci, Relationship.source_ci_id == source_ci.id)
+        .outerjoin(target_ci, Relationship.target_ci_id == target_ci.id)
+    ).mappings().all()
+
+    # Rows already have the response shape; skip re-validating them
+    return ORJSONResponse([dict(row) for row in rows])
+
+
 @router.get("/ci/{ci_id}", response_model=List[RelationshipResponse])
 def get_ci_relationships(
     ci_id: int,
@@ -1,12 +1,12 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, cast, String
 from app.db.database import get_db
 from app.db.models import SoftwareCatalog, SoftwareCategory, SoftwareStatus, ConfigurationItem, CIStatus
+from app.services.software_service import sync_software_aliases
 from pydantic import BaseModel
 from datetime import datetime
-import json
 
 router = APIRouter()
 
@@ -37,7 +37,7 @@ def get_software_catalog(
             or_(
                 SoftwareCatalog.name.ilike(f"%{search}%"),
                 SoftwareCatalog.publisher.ilike(f"%{search}%"),
-                SoftwareCatalog.aliases.ilike(f"%{search}%")
+                cast(SoftwareCatalog.aliases, String).ilike(f"%{search}%")
             )
         )
     if category:
@@ -52,7 +52,7 @@ def get_software_catalog(
     for item in items:
         count = db.query(func.count(ConfigurationItem.id)).filter(ConfigurationItem.software_id == item.id).scalar()
         item_dict = item.__dict__
-        item_dict['aliases'] = json.loads(item.aliases) if item.aliases else []
+        item_dict['aliases'] = item.aliases or []
         item_dict['ci_count'] = count
         results.append(item_dict)
         
@@ -60,9 +60,6 @@ def get_software_catalog(
 
 @router.post("/", response_model=SoftwareCatalogResponse)
 def create_software_item(item: SoftwareCatalogCreate, db: Session = Depends(get_db)):
-    # specific handling for aliases list -> json string
-    aliases_json = json.dumps(item.aliases) if item.aliases else None
-    
     db_item = SoftwareCatalog(
         name=item.name,
         version=item.version,
@@ -70,15 +67,16 @@ def create_software_item(item: SoftwareCatalogCreate, db: Session = Depends(get_
         category=item.category,
         status=item.status,
         end_of_life_date=item.end_of_life_date,
-        aliases=aliases_json
+        aliases=item.aliases or None
     )
     db.add(db_item)
+    sync_software_aliases(db, db_item)
     db.commit()
     db.refresh(db_item)
     
     # Return matched format
     res = db_item.__dict__
-    res['aliases'] = json.loads(db_item.aliases) if db_item.aliases else []
+    res['aliases'] = db_item.aliases or []
     res['ci_count'] = 0
     return res
 
@@ -94,7 +92,8 @@ def update_software_item(item_id: int, item_in: SoftwareCatalogUpdate, db: Sessi
     db_item.category = item_in.category
     db_item.status = item_in.status
     db_item.end_of_life_date = item_in.end_of_life_date
-    db_item.aliases = json.dumps(item_in.aliases) if item_in.aliases else None
+    db_item.aliases = item_in.aliases or None
+    sync_software_aliases(db, db_item)
     
     db.commit()
     db.refresh(db_item)
@@ -102,7 +101,7 @@ def update_software_item(item_id: int, item_in: SoftwareCatalogUpdate, db: Sessi
     ci_count = db.query(func.count(ConfigurationItem.id)).filter(ConfigurationItem.software_id == db_item.id).scalar()
     
     res = db_item.__dict__
-    res['aliases'] = json.loads(db_item.aliases) if db_item.aliases else []
+    res['aliases'] = db_item.aliases or []
     res['ci_count'] = ci_count
     return res
 
@@ -145,10 +144,11 @@ def match_alias(data: MatchRequest, db: Session = Depends(get_db)):
     # 2. Add to aliases if new
     software = db.query(SoftwareCatalog).filter(SoftwareCatalog.id == data.software_id).first()
     if software:
-        current_aliases = json.loads(software.aliases) if software.aliases else []
+        current_aliases = software.aliases or []
         if data.string_to_match not in current_aliases:
-            current_aliases.append(data.string_to_match)
-            software.aliases = json.dumps(current_aliases)
+            # Assign a new list so the JSON column is flagged as modified
+            software.aliases = current_aliases + [data.string_to_match]
+            sync_software_aliases(db, software)
             
     db.commit()
     return {"message": "Matched successfully", "updated_count": updated_count}
@@ -1,7 +1,7 @@
 """
 Application configuration management using Pydantic Settings.
 """
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
 
@@ -11,6 +11,9 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Create missing tables on startup (disable where the schema is managed by migration scripts)
+    AUTO_CREATE_SCHEMA: bool = True
+    
     # JWT Authentication
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -31,6 +34,9 @@ class Settings(BaseSettings):
     KEYCLOAK_CLIENT_ID: str = ""
     KEYCLOAK_CLIENT_SECRET: str = ""
     
+    # Seconds a single DNS lookup may take during domain resolution
+    DNS_TIMEOUT: float = 5.0
+    
     # Application
     APP_NAME: str = "ITIL CMDB Dashboard"
     DEBUG: bool = True
@@ -42,9 +48,7 @@ class Settings(BaseSettings):
         """Convert CORS origins string to list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 
 settings = Settings()
@@ -142,13 +142,14 @@ def parse_import_config(config_json: str) -> Dict[str, Any]:
     Parse and validate import source configuration.
     
     Args:
-        config_json: JSON string with import configuration
+        config_json: JSON string or dict with import configuration
         
     Returns:
         Parsed configuration dictionary
     """
     try:
-        config = json.loads(config_json) if isinstance(config_json, str) else config_json
+        # Copy stored (JSONB) configs so the defaults below don't mutate the ORM value
+        config = json.loads(config_json) if isinstance(config_json, str) else dict(config_json)
         
         # Ensure required sections exist
         if 'field_mapping' not in config:
@@ -3,7 +3,6 @@ import platform
 import logging
 import socket
 from datetime import datetime
-import json
 from sqlalchemy.orm import Session
 from app.db.models import ConfigurationItem, CIType
 
@@ -85,8 +84,8 @@ class HealthService:
             # 1. Try to find port in technical definitions
             if ci.technical_details:
                 try:
-                    details_json = json.loads(ci.technical_details)
-                    if 'port' in details_json:
+                    details_json = ci.technical_details
+                    if isinstance(details_json, dict) and 'port' in details_json:
                         target_ports.append(int(details_json['port']))
                 except:
                     pass
@@ -3,13 +3,15 @@ Import Engine for CMDB.
 Handles data fetching from external sources and reconciliation with internal CIs.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Iterator
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import logging
 import json
 from datetime import datetime
 import requests
-from sqlalchemy.orm import Session
-from app.db.models import ConfigurationItem, ImportSource, ImportLog, CIType, CIStatus
+from sqlalchemy import select, case, cast, func
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.orm import Session, defer
+from app.db.models import ConfigurationItem, ImportSource, ImportLog, CIType, CIStatus, RelationType
 from app.core.field_mapper import FieldMapper, ReconciliationConfig, parse_import_config
 try:
     import oracledb
@@ -29,6 +31,20 @@ import os
 
 logger = logging.getLogger(__name__)
 
+# Rows per batch for connectors that can stream their source (CSV, Oracle)
+FETCH_BATCH_SIZE = 5000
+# CIs loaded for reconciliation never read raw_data: _update_ci merges into it in the
+# UPDATE itself, so the (large) payload is not fetched with the row
+_SKIP_RAW_DATA = defer(ConfigurationItem.raw_data)
+
+
+def _raw_data_object():
+    """SQL expression for a CI's current raw_data as a JSON object; non-object values start over."""
+    return case(
+        (func.jsonb_typeof(ConfigurationItem.raw_data) == 'object', ConfigurationItem.raw_data),
+        else_=cast({}, JSONB)
+    )
+
 class Connector(ABC):
     """Base class for import connectors."""
     
@@ -645,8 +661,11 @@ class OracleConnector(Connector):
                     columns = [col[0] for col in cursor.description]
                     cursor.rowfactory = lambda *args: dict(zip(columns, args))
                     
-                    rows = cursor.fetchall()
-                    yield rows
+                    while True:
+                        rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+                        if not rows:
+                            break
+                        yield rows
                     
         except oracledb.Error as e:
             logger.error(f"Oracle DB Error: {e}")
@@ -1058,10 +1077,11 @@ class CSVConnector(Connector):
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"CSV file not found: {file_path}")
                 
-            df = pd.read_csv(file_path)
-            # Replace NaN with None for JSON compatibility
-            df = df.where(pd.notnull(df), None)
-            yield df.to_dict('records')
+            # Read in chunks so large files never sit in memory as a whole
+            for df in pd.read_csv(file_path, chunksize=FETCH_BATCH_SIZE):
+                # Replace NaN with None for JSON compatibility
+                df = df.astype(object).where(pd.notnull(df), None)
+                yield df.to_dict('records')
             
         except Exception as e:
             logger.error(f"Error reading CSV file: {e}")
@@ -1106,6 +1126,10 @@ class ReconciliationService:
     def __init__(self, db: Session, source: ImportSource):
         self.db = db
         self.source = source
+        # Plain copies: reading them from the instance after a commit/rollback
+        # (which expires it) would re-SELECT the source row
+        self.source_id = source.id
+        self.source_type = source.source_type
         
         # Parse configuration
         self.config = parse_import_config(source.config or '{}')
@@ -1125,104 +1149,156 @@ class ReconciliationService:
         
         # Initialize audit log to track detailed changes
         self.audit_log = []
+        # Number of audit entries already appended to the log file
+        self._audit_flushed = 0
+
+        # CIs of the current batch keyed by external ID (see _load_batch_cis)
+        self._batch_cis: Dict[str, ConfigurationItem] = {}
+
+        # Record counters, copied onto self.log once per batch (_sync_log_counts).
+        # Counting on the log row itself would make it dirty for every record's flush
+        self._counts = dict.fromkeys(
+            ('records_processed', 'records_success', 'records_failed', 'records_created', 'records_updated'), 0
+        )
+
+    def _sync_log_counts(self):
+        """Copy the record counters onto the import log row."""
+        for name, value in self._counts.items():
+            setattr(self.log, name, value)
+
+    def _flush_audit_log(self, filepath: str):
+        """Append audit entries not yet on disk as NDJSON (one JSON object per line)."""
+        with open(filepath, 'a') as f:
+            for entry in self.audit_log[self._audit_flushed:]:
+                f.write(json.dumps(entry, default=str) + '\n')
+        self._audit_flushed = len(self.audit_log)
 
     def run_import(self):
         """Execute the import process."""
         try:
             connector = self._get_connector()
             if not connector:
-                raise ValueError(f"Unknown source type: {self.source.source_type}")
+                raise ValueError(f"Unknown source type: {self.source_type}")
 
-            # Stream data in batches
-            self.log.records_processed = 0
-            
             # Prepare log file path early to enable incremental writing
             log_dir = os.path.join(os.getcwd(), "logs")
             os.makedirs(log_dir, exist_ok=True)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"import_{self.source.id}_{timestamp}.json"
+            filename = f"import_{self.source_id}_{timestamp}.ndjson"
             filepath = os.path.join(log_dir, filename)
             
             # Raw log file
-            raw_filename = f"raw_import_{self.source.id}_{timestamp}.json"
+            raw_filename = f"raw_import_{self.source_id}_{timestamp}.json"
             raw_filepath = os.path.join(log_dir, raw_filename)
             
             raw_data_generator = connector.fetch_data()
             errors = []
-            all_raw_records = []
-            
-            processed_cis: List[Tuple[ConfigurationItem, Dict[str, Any]]] = []
-
-            for batch in raw_data_generator:
-                all_raw_records.extend(batch)
-                batch_count = 0
-                for raw_record in batch:
-                    try:
-                        self.log.records_processed += 1
-                        batch_count += 1
+            relationships_failed = False
+            
+            # (id, name, raw record) of every reconciled CI for the relationship pass; kept as
+            # plain values since the batch commit expires the CI objects, and reading them
+            # again would refresh the whole row, raw_data included
+            processed_cis: List[Tuple[int, str, Dict[str, Any]]] = []
+
+            # Raw records are streamed into a JSON array instead of being kept in memory
+            with open(raw_filepath, 'w') as raw_file:
+                raw_file.write('[')
+                raw_count = 0
+
+                for batch in raw_data_generator:
+                    for raw_record in batch:
+                        raw_file.write(',\n' if raw_count else '\n')
+                        raw_file.write(json.dumps(raw_record, indent=2, default=str))
+                        raw_count += 1
+                    raw_file.flush()
+
+                    # One lookup per batch for CIs already known by external ID
+                    self._load_batch_cis(batch)
+                    batch_count = 0
+                    for raw_record in batch:
+                        try:
+                            self._counts['records_processed'] += 1
+                            batch_count += 1
                         
-                        # Map external data to CMDB format
-                        mapped_record = self.field_mapper.map_data(raw_record)
-                        ci = self._process_record(mapped_record, raw_record)
-                        if ci:
-                            processed_cis.append((ci, raw_record))
-                    except Exception as e:
-                        logger.error(f"Failed to process record: {e}")
-                        self.db.rollback()  # Reset session state after failure
-                        self.log.records_failed += 1
-                        errors.append({
-                            "record": str(raw_record),
-                            "error": str(e)
-                        })
+                            # Map external data to CMDB format
+                            mapped_record = self.field_mapper.map_data(raw_record)
+                            # Each record is flushed inside its own SAVEPOINT: a failing record
+                            # is undone alone, and the batch is committed once below
+                            with self.db.begin_nested():
+                                ci = self._process_record(mapped_record, raw_record)
+                            if ci:
+                                processed_cis.append((ci.id, ci.name, raw_record))
+                        except Exception as e:
+                            logger.error(f"Failed to process record: {e}")
+                            self._counts['records_failed'] += 1
+                            errors.append({
+                                "record": str(raw_record),
+                                "error": str(e)
+                            })
                 
-                # Commit progress and write logs after every batch
-                try:
-                    self.db.commit()
-                    # Refresh log object to prevent stale data
-                    self.db.refresh(self.log)
+                    # Commit progress and write logs after every batch
+                    try:
+                        self._sync_log_counts()
+                        self.db.commit()
+                        # Refresh log object to prevent stale data
+                        self.db.refresh(self.log)
                     
-                    # Incremental Log Write: Overwrite file with current state
-                    with open(filepath, 'w') as f:
-                        json.dump(self.audit_log, f, indent=2, default=str)
+                        # Incremental Log Write: append this batch's entries
+                        self._flush_audit_log(filepath)
                         
-                    # Write Raw Data Log (Incremental verify)
-                    with open(raw_filepath, 'w') as f:
-                        json.dump(all_raw_records, f, indent=2, default=str)
-                        
-                    # Update details in DB with file path
-                    summary_data = {
-                        "log_file": filepath,
-                        "raw_file": raw_filepath,
-                        "summary": f"In Progress: Processed {self.log.records_processed}...",
-                        "errors": errors
-                    }
-                    self.log.details = json.dumps(summary_data)
-                    self.db.commit() # Commit the detail update
+                        # Update details in DB with file path
+                        summary_data = {
+                            "log_file": filepath,
+                            "raw_file": raw_filepath,
+                            "summary": f"In Progress: Processed {self.log.records_processed}...",
+                            "errors": errors
+                        }
+                        self.log.details = summary_data
+                        self.db.commit() # Commit the detail update
                     
-                except Exception as e:
-                    logger.error(f"Failed to commit batch progress or write logs: {e}")
-                    self.db.rollback()
-            
+                    except Exception as e:
+                        logger.error(f"Failed to commit batch progress or write logs: {e}")
+                        self.db.rollback()
+
+                raw_file.write('\n]\n')
+
             # Second Pass: Process Relationships
             # Now that all CIs are created/updated, we can safely link them.
             if self.config.get('relationship_mapping'):
                 logger.info("Starting relationship processing pass...")
-                for ci, raw_rec in processed_cis:
+                # Resolve targets from one name -> id map instead of a query per edge
+                self._name_to_id = dict(self.db.execute(
+                    select(ConfigurationItem.name, ConfigurationItem.id).where(ConfigurationItem.deleted_at.is_(None))
+                ).all())
+                self._ci_names = {}
+                pending_relationships = []
+                for ci_id, ci_name, raw_rec in processed_cis:
                     try:
-                         # Refresh CI to ensure attached to session (though should be if session mostly alive)
-                         # If session was cleared or rolled back, we might need to re-query, but let's try direct.
-                         self._process_relationships(ci, raw_rec)
+                         pending_relationships.extend(self._process_relationships(ci_id, ci_name, raw_rec))
                     except Exception as e:
                          # Don't fail the whole import for a relationship error, just log it
-                         logger.error(f"Relationship processing failed for {ci.name}: {e}")
-                         # Maybe add to errors list or a separate relationship errors list?
-                self.db.commit()
+                         logger.error(f"Relationship processing failed for {ci_name}: {e}")
+                try:
+                    self._insert_relationships(pending_relationships)
+                    self.db.commit()
+                except Exception as e:
+                    # The CIs are already committed, but none of the relationships are:
+                    # report it in the log instead of finishing as a plain success.
+                    # ON CONFLICT needs uq_relationship_edge (scripts/add_relationship_unique_constraint.py)
+                    logger.error(f"Relationship insert failed: {e}")
+                    self.db.rollback()
+                    relationships_failed = True
+                    errors.append({
+                        "record": f"{len(pending_relationships)} relationships",
+                        "error": f"Relationship insert failed: {e}"
+                    })
 
 
+            self._sync_log_counts()
+
             # Final Write audit log to file (to ensure completion)
             try:
-                with open(filepath, 'w') as f:
-                    json.dump(self.audit_log, f, indent=2, default=str)
+                self._flush_audit_log(filepath)
                 
                 # Update log details with summary and file path
                 summary_data = {
@@ -1231,15 +1307,15 @@ class ReconciliationService:
                     "summary": f"Processed {len(self.audit_log)} changes ({self.log.records_success} success (Created: {self.log.records_created}, Updated: {self.log.records_updated}), {self.log.records_failed} failed).",
                     "errors": errors
                 }
-                self.log.details = json.dumps(summary_data)
+                self.log.details = summary_data
                 
             except Exception as e:
                 logger.error(f"Failed to write audit log: {e}")
                 # Fallback: at least save errors in details
                 if errors:
-                    self.log.details = json.dumps(errors)
+                    self.log.details = errors
 
-            self.log.status = "success" if self.log.records_failed == 0 else "partial_success"
+            self.log.status = "success" if self.log.records_failed == 0 and not relationships_failed else "partial_success"
             self.log.completed_at = datetime.utcnow()
             self.source.last_run = datetime.utcnow()
             self.db.commit()
@@ -1247,29 +1323,44 @@ class ReconciliationService:
         except Exception as e:
             self.db.rollback()  # Ensure rollback on outer exception
             logger.error(f"Import failed: {e}")
+            self._sync_log_counts()
             self.log.status = "failed"
             self.log.error_message = str(e)
             self.log.completed_at = datetime.utcnow()
             self.db.commit()
 
+    def _load_batch_cis(self, batch: List[Dict[str, Any]]):
+        """Fetch the CIs for all external IDs of a batch with one query per 1000 IDs."""
+        external_ids = list({
+            str(ext_id) for ext_id in (r.get('id') or r.get('ID') or r.get('Id') for r in batch) if ext_id
+        })
+        self._batch_cis = {}
+        for i in range(0, len(external_ids), 1000):
+            cis = self.db.query(ConfigurationItem).options(_SKIP_RAW_DATA).filter(
+                ConfigurationItem.external_id.in_(external_ids[i:i + 1000]),
+                ConfigurationItem.import_source_id == self.source_id
+            ).all()
+            for ci in cis:
+                self._batch_cis[ci.external_id] = ci
+
     def _get_connector(self) -> Optional[Connector]:
         # Inject last_run into config for incremental imports
         if self.source.last_run:
             self.config['last_run'] = self.source.last_run.isoformat()
 
-        if self.source.source_type == "sharepoint":
+        if self.source_type == "sharepoint":
             return SharePointConnector(self.config)
-        elif self.source.source_type == "idoit":
+        elif self.source_type == "idoit":
             return IDoitConnector(self.config)
-        elif self.source.source_type == "oracle":
+        elif self.source_type == "oracle":
             return OracleConnector(self.config)
-        elif self.source.source_type == "csv":
+        elif self.source_type == "csv":
             return CSVConnector(self.config)
-        elif self.source.source_type == "vcenter":
+        elif self.source_type == "vcenter":
             return VCenterConnector(self.config)
-        elif self.source.source_type == "wsus":
+        elif self.source_type == "wsus":
             return WSUSConnector(self.config)
-        elif self.source.source_type == "baramundi":
+        elif self.source_type == "baramundi":
             return BaramundiConnector(self.config)
         return None
 
@@ -1279,7 +1370,7 @@ class ReconciliationService:
         match_value = self.recon_config.get_match_value(mapped_record)
         if not match_value:
             logger.warning(f"No reconciliation key found in record: {mapped_record}")
-            self.log.records_failed += 1
+            self._counts['records_failed'] += 1
             return None
 
         # Try to find existing CI by External ID + Source (Stable ID)
@@ -1288,10 +1379,7 @@ class ReconciliationService:
         ci = None
         
         if external_id:
-             ci = self.db.query(ConfigurationItem).filter(
-                ConfigurationItem.external_id == str(external_id),
-                ConfigurationItem.import_source_id == self.source.id
-            ).first()
+            ci = self._batch_cis.get(str(external_id))
 
         # Fallback to Key Field matching if not found by External ID
         if not ci:
@@ -1299,38 +1387,60 @@ class ReconciliationService:
             key_field = self.recon_config.key_field
             
             if self.recon_config.match_strategy == 'case_insensitive':
-                ci = self.db.query(ConfigurationItem).filter(
+                ci = self.db.query(ConfigurationItem).options(_SKIP_RAW_DATA).filter(
                     getattr(ConfigurationItem, key_field).ilike(match_value)
                 ).first()
             else:
-                ci = self.db.query(ConfigurationItem).filter(
+                ci = self.db.query(ConfigurationItem).options(_SKIP_RAW_DATA).filter(
                     getattr(ConfigurationItem, key_field) == match_value
                 ).first()
 
         if ci:
             # Update existing CI
             was_updated = self._update_ci(ci, mapped_record, raw_record)
-            self.log.records_success += 1
+            self._counts['records_success'] += 1
             if was_updated:
-                self.log.records_updated += 1
+                self._counts['records_updated'] += 1
             return ci
         elif self.recon_config.update_mode == 'upsert':
             # Create new CI only if in upsert mode
             new_ci = self._create_ci(mapped_record, raw_record)
-            self.log.records_success += 1
-            self.log.records_created += 1
+            self._counts['records_success'] += 1
+            self._counts['records_created'] += 1
             return new_ci
         else:
             # Skip creation in 'update_only' mode
             logger.info(f"Skipping new CI creation (Update Only mode): {match_value}")
-            self.log.records_success += 1
+            self._counts['records_success'] += 1
             return None
 
     def _create_ci(self, mapped_record: Dict[str, Any], raw_record: Dict[str, Any]) -> ConfigurationItem:
         """Create a new CI from mapped data."""
+        ci_data = self._ci_values(mapped_record, raw_record)
+        
+        new_ci = ConfigurationItem(**ci_data, last_sync=func.now())
+        self.db.add(new_ci)
+        # Flush only (for the id and for later key lookups); run_import commits per batch
+        self.db.flush()
+        logger.info(f"Created new CI: {new_ci.name}")
+        if new_ci.external_id:
+            self._batch_cis[str(new_ci.external_id)] = new_ci
+        
+        self.audit_log.append({
+            "action": "created",
+            "ci_id": new_ci.id,
+            "ci_name": new_ci.name,
+            "data": ci_data,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        
+        return new_ci
+
+    def _ci_values(self, mapped_record: Dict[str, Any], raw_record: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values for a new CI built from mapped data."""
         # Initialize raw_data as a dict with the current source type
         initial_raw_data = {
-            self.source.source_type: raw_record
+            self.source_type: raw_record
         }
 
         ci_data = {
@@ -1348,29 +1458,14 @@ class ReconciliationService:
             'os_db_system': mapped_record.get('os_db_system') or mapped_record.get('operating_system'),
             'domain': mapped_record.get('domain'),
             'external_id': raw_record.get('id') or raw_record.get('ID'),
-            'import_source_id': self.source.id,
-            'last_sync': datetime.utcnow(),
-            'raw_data': json.dumps(initial_raw_data, default=str)
+            'import_source_id': self.source_id,
+            'raw_data': initial_raw_data
         }
-        
-        new_ci = ConfigurationItem(**ci_data)
-        self.db.add(new_ci)
-        self.db.commit()
-        logger.info(f"Created new CI: {new_ci.name}")
-        
-        self.audit_log.append({
-            "action": "created",
-            "ci_id": new_ci.id,
-            "ci_name": new_ci.name,
-            "data": ci_data,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        
-        return new_ci
+        return ci_data
 
-    def _process_relationships(self, source_ci: ConfigurationItem, raw_record: Dict[str, Any]):
+    def _process_relationships(self, source_id: int, source_name: str, raw_record: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Process configured relationship mappings.
+        Resolve configured relationship mappings into Relationship rows to insert.
         Expected config format:
         {
             "relationships": [
@@ -1385,13 +1480,16 @@ class ReconciliationService:
         """
         relationship_mappings = self.config.get('relationship_mapping', [])
         if not relationship_mappings:
-            return
+            return []
 
-        from app.db.models import Relationship
-        
+        relationships = []
+        self._ci_names[source_id] = source_name
         for mapping in relationship_mappings:
             col_name = mapping.get('source_column')
-            rel_type = mapping.get('relationship_type')
+            rel_type = RelationType.from_value(mapping.get('relationship_type'))
+            if rel_type is None:
+                logger.warning(f"Relationship Import: Unknown relationship type '{mapping.get('relationship_type')}' for column '{mapping.get('source_column')}'")
+                continue
             separator = mapping.get('separator', ',')
             # direction = mapping.get('direction', 'outbound') # Not fully implemented yet, assuming outbound
             
@@ -1403,42 +1501,41 @@ class ReconciliationService:
             target_names = [n.strip() for n in str(raw_value).split(separator) if n.strip()]
             
             for target_name in target_names:
-                # Find Target CI
-                # Try exact match first
-                target_ci = self.db.query(ConfigurationItem).filter(
-                    ConfigurationItem.name == target_name,
-                    ConfigurationItem.deleted_at.is_(None)
-                ).first()
-                
-                if not target_ci:
-                    logger.warning(f"Relationship Import: Target CI '{target_name}' not found for source '{source_ci.name}'")
+                target_id = self._name_to_id.get(target_name)
+                if target_id is None:
+                    logger.warning(f"Relationship Import: Target CI '{target_name}' not found for source '{source_name}'")
                     continue
-                
-                # Check if relationship already exists
-                existing_rel = self.db.query(Relationship).filter(
-                    Relationship.source_ci_id == source_ci.id,
-                    Relationship.target_ci_id == target_ci.id,
-                    Relationship.relationship_type == rel_type
-                ).first()
-                
-                if not existing_rel:
-                    new_rel = Relationship(
-                        source_ci_id=source_ci.id,
-                        target_ci_id=target_ci.id,
-                        relationship_type=rel_type,
-                        description=f"Imported from column {col_name}"
-                    )
-                    self.db.add(new_rel)
-                    self.db.commit()
-                    logger.info(f"Created Relationship: {source_ci.name} -> {target_name} ({rel_type})")
-                    
-                    self.audit_log.append({
-                        "action": "relationship_created",
-                        "source": source_ci.name,
-                        "target": target_name,
-                        "type": rel_type,
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
+
+                self._ci_names[target_id] = target_name
+                relationships.append({
+                    "source_ci_id": source_id,
+                    "target_ci_id": target_id,
+                    "relationship_type": rel_type,
+                    "description": f"Imported from column {col_name}"
+                })
+
+        return relationships
+
+    def _insert_relationships(self, relationships: List[Dict[str, Any]]):
+        """Bulk insert relationships, skipping edges that already exist."""
+        from app.db.models import Relationship
+
+        for i in range(0, len(relationships), 1000):
+            stmt = pg_insert(Relationship).values(relationships[i:i + 1000]).on_conflict_do_nothing(
+                index_elements=['source_ci_id', 'target_ci_id', 'relationship_type']
+            ).returning(Relationship.source_ci_id, Relationship.target_ci_id, Relationship.relationship_type)
+
+            for source_id, target_id, rel_type in self.db.execute(stmt):
+                source_name = self._ci_names.get(source_id)
+                target_name = self._ci_names.get(target_id)
+                logger.info(f"Created Relationship: {source_name} -> {target_name} ({rel_type})")
+                self.audit_log.append({
+                    "action": "relationship_created",
+                    "source": source_name,
+                    "target": target_name,
+                    "type": rel_type.value,
+                    "timestamp": datetime.utcnow().isoformat()
+                })
 
     def _update_ci(self, ci: ConfigurationItem, mapped_record: Dict[str, Any], raw_record: Dict[str, Any]) -> bool:
         """Update existing CI based on conflict resolution rules. Returns True if changes were made."""
@@ -1470,31 +1567,18 @@ class ReconciliationService:
                             "new": str_new
                         }
         
-        # Always update sync metadata
-        ci.last_sync = datetime.utcnow()
+        # Always update sync metadata (timestamp taken by the server)
+        ci.last_sync = func.now()
         ci.deleted_at = None  # Resurrect if deleted
         if raw_record.get('id') or raw_record.get('ID'):
             ci.external_id = raw_record.get('id') or raw_record.get('ID')
         
-        # Parse existing raw_data to merge instead of overwrite
-        current_raw = {}
-        if ci.raw_data:
-            if isinstance(ci.raw_data, dict):
-                current_raw = ci.raw_data
-            elif isinstance(ci.raw_data, str):
-                try:
-                    current_raw = json.loads(ci.raw_data)
-                    # If loaded JSON is not a dict (e.g. list), reset it
-                    if not isinstance(current_raw, dict):
-                         current_raw = {}
-                except Exception:
-                    current_raw = {}
-        
-        # Update only this source's section
-        current_raw[self.source.source_type] = raw_record
-        ci.raw_data = json.dumps(current_raw, default=str)
+        # Replace only this source's section, merged server-side in the UPDATE
+        # (no read-modify-write of the whole payload)
+        ci.raw_data = _raw_data_object().op('||')(cast({self.source_type: raw_record}, JSONB))
         
-        self.db.commit()
+        # Flush only: a commit here would expire every CI of the batch; run_import commits per batch
+        self.db.flush()
         
         if changes:
             logger.info(f"Updated CI: {ci.name} (fields: {', '.join(updated_fields)})")
@@ -1521,39 +1605,40 @@ class ReconciliationService:
         """Parse CI type from string."""
         if not type_str:
             return CIType.OTHER
+
+        type_str = type_str.lower()
+        ci_type = CIType.from_value(type_str)
+        if ci_type is not None:
+            return ci_type
         
+        # Aliases that are not plain CIType values
         type_map = {
-            'server': CIType.SERVER,
-            'workstation': CIType.WORKSTATION,
-            'network': CIType.NETWORK_DEVICE,
-            'storage': CIType.STORAGE,
-            'application': CIType.APPLICATION,
-            'database': CIType.DATABASE,
-            'service': CIType.SERVICE
+            'network': CIType.NETWORK_DEVICE
         }
         
-        return type_map.get(type_str.lower(), CIType.OTHER)
+        return type_map.get(type_str, CIType.OTHER)
 
     def _parse_ci_status(self, status_str: Optional[str]) -> CIStatus:
         """Parse CI status from string."""
         if not status_str:
             return CIStatus.ACTIVE
+
+        status_str = status_str.lower()
+        status = CIStatus.from_value(status_str)
+        if status is not None:
+            return status
             
+        # Aliases (incl. German source values) that are not plain CIStatus values
         status_map = {
-            'active': CIStatus.ACTIVE,
             'aktiv': CIStatus.ACTIVE,
             'live': CIStatus.ACTIVE,
-            'inactive': CIStatus.INACTIVE,
             'inaktiv': CIStatus.INACTIVE,
-            'retired': CIStatus.RETIRED,
             'abgeschaltet': CIStatus.RETIRED,
-            'planned': CIStatus.PLANNED,
             'geplant': CIStatus.PLANNED,
-            'maintenance': CIStatus.MAINTENANCE,
             'wartung': CIStatus.MAINTENANCE
         }
         
-        return status_map.get(status_str.lower(), CIStatus.ACTIVE)
+        return status_map.get(status_str, CIStatus.ACTIVE)
 
 def get_connector_for_test(source_type: str, config: Dict[str, Any]) -> Optional[Connector]:
     """Factory to get a connector for testing purposes."""
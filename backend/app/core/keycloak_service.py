@@ -1,9 +1,35 @@
+import hashlib
+import time
+from typing import Dict, Optional, Tuple
+from jose import jwt
 from keycloak import KeycloakOpenID
 from app.core.config import settings
 
+# Seconds a userinfo response is reused for the same access token
+USERINFO_CACHE_TTL = 60
+USERINFO_CACHE_MAXSIZE = 10_000
+# Seconds the realm's signing keys (JWKS) are reused before being fetched again
+JWKS_CACHE_TTL = 3600
+# Minimum seconds between JWKS refetches forced by an unknown key ID
+JWKS_REFRESH_MIN_INTERVAL = 60
+
 class KeycloakService:
+    __slots__ = (
+        "enabled", "keycloak_openid", "_auth_url", "_token", "_userinfo", "_certs",
+        "_userinfo_cache", "_auth_urls", "_jwks", "_jwks_expires_at", "_jwks_fetched_at", "_issuer"
+    )
+
     def __init__(self):
-        self.enabled = bool(settings.KEYCLOAK_URL and settings.KEYCLOAK_REALM and settings.KEYCLOAK_CLIENT_ID) 
+        self.enabled = bool(settings.KEYCLOAK_URL and settings.KEYCLOAK_REALM and settings.KEYCLOAK_CLIENT_ID)
+        # token digest -> (expires_at, userinfo)
+        self._userinfo_cache: Dict[bytes, Tuple[float, dict]] = {}
+        # redirect_uri -> auth URL (deterministic without a state parameter)
+        self._auth_urls: Dict[str, str] = {}
+        self._jwks: Optional[dict] = None
+        self._jwks_expires_at = 0.0
+        self._jwks_fetched_at = float("-inf")
+        # Expected 'iss' claim of tokens issued by the realm
+        self._issuer = f"{settings.KEYCLOAK_URL.rstrip('/')}/realms/{settings.KEYCLOAK_REALM}"
         if self.enabled:
             self.keycloak_openid = KeycloakOpenID(
                 server_url=settings.KEYCLOAK_URL,
@@ -12,23 +38,86 @@ class KeycloakService:
                 client_secret_key=settings.KEYCLOAK_CLIENT_SECRET,
                 verify=True
             )
+            # Bound once so each call skips the attribute lookup on the client
+            self._auth_url = self.keycloak_openid.auth_url
+            self._token = self.keycloak_openid.token
+            self._userinfo = self.keycloak_openid.userinfo
+            self._certs = self.keycloak_openid.certs
 
     def get_auth_url(self, redirect_uri: str) -> str:
         """Get the URL to redirect the user to for authentication."""
         if not self.enabled:
             return ""
-        return self.keycloak_openid.auth_url(redirect_uri=redirect_uri)
+        if redirect_uri not in self._auth_urls:
+            self._auth_urls[redirect_uri] = self._auth_url(redirect_uri=redirect_uri)
+        return self._auth_urls[redirect_uri]
 
     def get_token(self, code: str, redirect_uri: str):
         """Exchange the authorization code for an access token."""
         if not self.enabled:
             return None
-        return self.keycloak_openid.token(code=code, redirect_uri=redirect_uri, grant_type="authorization_code")
+        return self._token(code=code, redirect_uri=redirect_uri, grant_type="authorization_code")
+
+    def _get_signing_key(self, kid: str, refresh: bool = False) -> Optional[dict]:
+        """
+        Return the realm JWK with the given key ID from the cached JWKS.
+        A forced refresh is skipped if the keys were fetched less than
+        JWKS_REFRESH_MIN_INTERVAL seconds ago, so tokens with made-up key IDs
+        cannot make every request fetch the JWKS again.
+        """
+        now = time.monotonic()
+        if refresh and now - self._jwks_fetched_at < JWKS_REFRESH_MIN_INTERVAL:
+            refresh = False
+        if refresh or self._jwks is None or self._jwks_expires_at <= now:
+            self._jwks = self._certs()
+            self._jwks_fetched_at = now
+            self._jwks_expires_at = now + JWKS_CACHE_TTL
+        return next((k for k in self._jwks.get("keys", []) if k.get("kid") == kid), None)
 
     def get_user_info(self, token: str):
-        """Get user information using the access token."""
+        """
+        Get user information from the access token.
+        The token is verified locally against the realm's JWKS; the remote userinfo
+        endpoint is only used when the signing key cannot be found.
+        """
         if not self.enabled:
             return None
-        return self.keycloak_openid.userinfo(token)
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid:
+            # Refetch on a miss (rate-limited) in case the realm rotated its keys
+            signing_key = self._get_signing_key(kid) or self._get_signing_key(kid, refresh=True)
+            if signing_key:
+                # Keycloak access tokens carry the client in 'azp'; 'aud' is usually 'account'
+                claims = jwt.decode(
+                    token,
+                    signing_key,
+                    algorithms=[signing_key.get("alg", "RS256")],
+                    issuer=self._issuer,
+                    options={"verify_aud": False}
+                )
+                if claims.get("azp") != settings.KEYCLOAK_CLIENT_ID:
+                    raise ValueError("Access token was not issued for this client")
+                return claims
+
+        return self._get_remote_user_info(token)
+
+    def _get_remote_user_info(self, token: str):
+        """Get user information from Keycloak's userinfo endpoint (cached per token for a short TTL)."""
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = time.monotonic()
+        cached = self._userinfo_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        user_info = self._userinfo(token)
+
+        if len(self._userinfo_cache) >= USERINFO_CACHE_MAXSIZE:
+            # Drop expired entries; if still full, start over rather than grow unbounded
+            self._userinfo_cache = {k: v for k, v in self._userinfo_cache.items() if v[0] > now}
+            if len(self._userinfo_cache) >= USERINFO_CACHE_MAXSIZE:
+                self._userinfo_cache.clear()
+        self._userinfo_cache[key] = (now + USERINFO_CACHE_TTL, user_info)
+        return user_info
 
 keycloak_service = KeycloakService()
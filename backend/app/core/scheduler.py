@@ -2,10 +2,13 @@ import logging
 """
 Scheduler for background tasks (Import jobs).
 """
+from functools import lru_cache
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, engine
 from app.db.models import ImportSource
 from app.core.import_engine import ReconciliationService
 from app.core.health_service import HealthService
@@ -13,7 +16,17 @@ from app.db.models import ConfigurationItem, CIStatus
 
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler()
+# Jobs are persisted in the application database so they survive restarts.
+# Fires missed during downtime are collapsed into one run instead of queuing up.
+scheduler = AsyncIOScheduler(
+    jobstores={"default": SQLAlchemyJobStore(engine=engine)},
+    job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 3600}
+)
+
+@lru_cache(maxsize=512)
+def _parse_cron(expr: str) -> CronTrigger:
+    """Parse a crontab expression once per distinct string. Parse errors are raised, never cached."""
+    return CronTrigger.from_crontab(expr)
 
 def get_db():
     db = SessionLocal()
@@ -79,32 +92,52 @@ def start_scheduler():
         )
         logger.info("Scheduled daily health check job at 00:00.")
         
-        # Load existing active sources and schedule them
+        # Persisted jobs survive restarts; only reconcile them with sources changed while we were down
         db = SessionLocal()
         try:
-            sources = db.query(ImportSource).filter(
-                ImportSource.is_active == True,
-                ImportSource.schedule_cron != None
+            # Only id and cron are needed; skip hydrating the config blobs
+            sources = db.execute(
+                select(ImportSource.id, ImportSource.schedule_cron).where(
+                    ImportSource.is_active == True,
+                    ImportSource.schedule_cron.isnot(None)
+                )
             ).all()
             
             for source in sources:
                 schedule_job(source)
+
+            active_job_ids = {f"import_{source.id}" for source in sources}
+            for job in scheduler.get_jobs():
+                if job.id.startswith("import_") and job.id not in active_job_ids:
+                    scheduler.remove_job(job.id)
+                    logger.info(f"Removed job {job.id} for inactive or unscheduled source.")
         finally:
             db.close()
 
-def schedule_job(source: ImportSource):
-    """Add or update a job in the scheduler."""
+def schedule_job(source):
+    """Add or update a job in the scheduler. Jobs whose cron is unchanged are left alone."""
     job_id = f"import_{source.id}"
+    existing_job = scheduler.get_job(job_id)
+
+    trigger = None
+    if source.schedule_cron:
+        try:
+            trigger = _parse_cron(source.schedule_cron)
+        except ValueError as e:
+            logger.warning(f"Invalid cron expression for job {job_id} ({source.schedule_cron!r}): {e}")
+
+    if existing_job and trigger and str(existing_job.trigger) == str(trigger):
+        return
     
     # Remove existing if any
-    if scheduler.get_job(job_id):
+    if existing_job:
         scheduler.remove_job(job_id)
     
-    if source.schedule_cron:
+    if trigger:
         try:
             scheduler.add_job(
                 run_import_job,
-                CronTrigger.from_crontab(source.schedule_cron),
+                trigger,
                 id=job_id,
                 args=[source.id],
                 replace_existing=True
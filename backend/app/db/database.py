@@ -1,17 +1,28 @@
 """
 Database connection and session management.
 """
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+
+def json_serializer(value) -> str:
+    """
+    Serializer for JSON(B) columns. Import payloads carry NaN (stored as null), datetimes
+    and other non-JSON types (stored as str), which stdlib json would emit invalidly or reject.
+    """
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_size=10,
-    max_overflow=20
+    max_overflow=20,
+    json_serializer=json_serializer
 )
 
 # Create session factory
@@ -1,14 +1,57 @@
 """
 Database models for ITIL CMDB.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Enum, Float, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Enum, Float, JSON, Index, UniqueConstraint
+from sqlalchemy import inspect as sa_inspect, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm.base import NO_VALUE
 from sqlalchemy.sql import func
 from app.db.database import Base
 import enum
+import json
+from itertools import chain
+
+
+# Binary JSONB on PostgreSQL (indexable with GIN), plain JSON on other backends
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def _load_json_text(value):
+    """Accept the legacy JSON-string form; text that is not JSON is kept as a JSON string."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def StringEnum(enum_cls):
+    """
+    VARCHAR column + CHECK constraint holding the member value (e.g. 'server').
+    Avoids a native PostgreSQL enum type; reads still return enum members.
+    """
+    return Enum(
+        enum_cls,
+        native_enum=False,
+        length=32,
+        create_constraint=True,
+        validate_strings=True,
+        values_callable=lambda members: [member.value for member in members]
+    )
+
+
+class EnumLookupMixin:
+    """Mixin for the enums whose members are looked up by value on import hot paths."""
+
+    @classmethod
+    def from_value(cls, value, default=None):
+        """Look up a member by value without going through Enum.__call__."""
+        return cls._value2member_map_.get(value, default)
 
 
-class CIStatus(str, enum.Enum):
+class CIStatus(EnumLookupMixin, str, enum.Enum):
     """Configuration Item status enumeration."""
     ACTIVE = "active"
     INACTIVE = "inactive"
@@ -17,7 +60,7 @@ class CIStatus(str, enum.Enum):
     MAINTENANCE = "maintenance"
 
 
-class CIType(str, enum.Enum):
+class CIType(EnumLookupMixin, str, enum.Enum):
     """Configuration Item type enumeration."""
     SERVER = "server"
     APPLICATION = "application"
@@ -29,7 +72,7 @@ class CIType(str, enum.Enum):
     OTHER = "other"
 
 
-class RelationType(str, enum.Enum):
+class RelationType(EnumLookupMixin, str, enum.Enum):
     """Relationship type enumeration."""
     DEPENDS_ON = "depends_on"
     RUNS_ON = "runs_on"
@@ -39,7 +82,7 @@ class RelationType(str, enum.Enum):
     MANAGED_BY = "managed_by"
 
 
-class UserRole(str, enum.Enum):
+class UserRole(EnumLookupMixin, str, enum.Enum):
     """User role enumeration."""
     ADMIN = "admin"
     EDITOR = "editor"
@@ -55,7 +98,7 @@ class User(Base):
     username = Column(String(100), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(255))
-    role = Column(Enum(UserRole), default=UserRole.VIEWER, nullable=False)
+    role = Column(StringEnum(UserRole), default=UserRole.VIEWER, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -64,10 +107,19 @@ class User(Base):
 class ConfigurationItem(Base):
     """Base Configuration Item model."""
     __tablename__ = "configuration_items"
+    __table_args__ = (
+        # Per-type dashboards and the health check filter on both columns.
+        # The partial health-check index lives in scripts/add_health_check_indexes.py
+        Index("ix_ci_type_status", "ci_type", "status"),
+        Index("ix_ci_technical_gin", "technical_details", postgresql_using="gin"),
+        # Existence checks during CSV import and the seed scripts match live CIs by (name, ci_type).
+        # Not unique: reconciliation may keep several live CIs with the same name and type
+        Index("ix_ci_name_type_active", "name", "ci_type", postgresql_where=text("deleted_at IS NULL")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
-    ci_type = Column(Enum(CIType), nullable=False, index=True)
+    ci_type = Column(StringEnum(CIType), nullable=False, index=True)
     status = Column(Enum(CIStatus), default=CIStatus.ACTIVE, nullable=False, index=True)
     domain = Column(String(255), nullable=True)
     description = Column(Text)
@@ -80,12 +132,11 @@ class ConfigurationItem(Base):
     service_provider = Column(String(255))  # e.g. BTC, CGI
     contact = Column(String(255))  # Person or Team responsible
     
-    # Technical details (JSON-like text field for flexibility)
-    # Technical details (JSON-like text field for flexibility)
-    technical_details = Column(Text)  # Store as JSON string
+    # Technical details (free-form JSON, e.g. {"port": 5432})
+    technical_details = Column(JSONType)
     
     # Raw Data from Import Source (Full JSON dump)
-    raw_data = Column(JSON, nullable=True)  # Store original import data
+    raw_data = Column(JSONType, nullable=True)  # Original import data, one section per source type
     patch_summary = Column(JSON, nullable=True) # Store WSUS/Patch summary: {needed: int, critical: int, etc}
     
     # Timestamps
@@ -98,7 +149,8 @@ class ConfigurationItem(Base):
     
     # Import / Sync
     external_id = Column(String(255), index=True)  # ID in the source system
-    last_sync = Column(DateTime(timezone=True))
+    # Last reconciliation from an import source; set by ReconciliationService, not on manual edits
+    last_sync = Column(DateTime(timezone=True), server_default=func.now())
     import_source_id = Column(Integer, ForeignKey("import_sources.id"), nullable=True)
 
     # Link to Software Catalog (DML)
@@ -119,30 +171,36 @@ class ConfigurationItem(Base):
         cascade="all, delete-orphan"
     )
 
+    @validates("technical_details", "raw_data")
+    def validate_json_text(self, key, value):
+        return _load_json_text(value)
+
     @property
     def relationships_summary(self) -> str:
-        """Returns a comma-separated string of related CIs."""
-        summary_parts = []
-        
-        # Source relationships
-        for rel in self.source_relationships:
-            if rel.target_ci:
-                summary_parts.append(rel.target_ci.name)
-                
-        # Target relationships
-        for rel in self.target_relationships:
-            if rel.source_ci:
-                summary_parts.append(rel.source_ci.name)
-                
-        if not summary_parts:
+        """
+        Returns a comma-separated string of related CIs.
+        Only relationship collections that are already loaded are used, so serializing
+        a CI never triggers lazy loads; load them with ci_response_options() when needed.
+        """
+        attrs = sa_inspect(self).attrs
+        sources = attrs.source_relationships.loaded_value
+        targets = attrs.target_relationships.loaded_value
+        if sources is NO_VALUE and targets is NO_VALUE:
             return None
-            
-        return ", ".join(summary_parts)
+        names = chain(
+            (rel.target_ci.name for rel in (sources if sources is not NO_VALUE else ()) if rel.target_ci),
+            (rel.source_ci.name for rel in (targets if targets is not NO_VALUE else ()) if rel.source_ci)
+        )
+        return ", ".join(names) or None
 
 
 class Relationship(Base):
     """Relationship between CIs."""
     __tablename__ = "relationships"
+    __table_args__ = (
+        Index("ix_rel_source_target", "source_ci_id", "target_ci_id"),
+        UniqueConstraint("source_ci_id", "target_ci_id", "relationship_type", name="uq_relationship_edge"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     source_ci_id = Column(Integer, ForeignKey("configuration_items.id"), nullable=False)
@@ -174,7 +232,11 @@ class ImportLog(Base):
     
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
-    details = Column(Text)  # JSON string for detailed logs
+    details = Column(JSONType)  # Summary, log file paths and errors
+
+    @validates("details")
+    def validate_details(self, key, value):
+        return _load_json_text(value)
 
 
 class ImportSource(Base):
@@ -184,7 +246,7 @@ class ImportSource(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, unique=True)
     source_type = Column(String(50), nullable=False)  # sharepoint, idoit
-    config = Column(Text)  # JSON string for credentials and settings
+    config = Column(JSONType)  # Credentials and settings
     is_active = Column(Boolean, default=True)
     
     # Schedule
@@ -195,6 +257,10 @@ class ImportSource(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    @validates("config")
+    def validate_config(self, key, value):
+        return _load_json_text(value)
+
 
 class Domain(Base):
     """Domain Configuration model."""
@@ -214,7 +280,7 @@ class CostRule(Base):
     __tablename__ = "cost_rules"
 
     id = Column(Integer, primary_key=True, index=True)
-    ci_type = Column(Enum(CIType), nullable=False, index=True)
+    ci_type = Column(StringEnum(CIType), nullable=False, index=True)
     sla = Column(String(255), nullable=True)
     os_db_system = Column(String(255), nullable=True)
     base_cost = Column(Float, nullable=False)
@@ -243,6 +309,9 @@ class SoftwareStatus(str, enum.Enum):
 class SoftwareCatalog(Base):
     """Definitive Media Library (DML) - Software Catalog."""
     __tablename__ = "software_catalog"
+    __table_args__ = (
+        Index("ix_software_aliases_gin", "aliases", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)  # e.g., "Windows Server 2022"
@@ -252,8 +321,8 @@ class SoftwareCatalog(Base):
     status = Column(Enum(SoftwareStatus), default=SoftwareStatus.UNAPPROVED, nullable=False)
     end_of_life_date = Column(DateTime(timezone=True), nullable=True)
     
-    # Aliases: stored as JSON list of strings [ "Win2022", "Windows 2022" ]
-    aliases = Column(Text) 
+    # Aliases: JSON list of strings [ "Win2022", "Windows 2022" ]
+    aliases = Column(JSONType)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -262,3 +331,14 @@ class SoftwareCatalog(Base):
     cis = relationship("ConfigurationItem", back_populates="software")
 
 
+class SoftwareAlias(Base):
+    """
+    Lookup table mapping an alias string (e.g. an OS name from an import) to a catalog entry.
+    Mirrors SoftwareCatalog.aliases; kept in sync by app.services.software_service.
+    """
+    __tablename__ = "software_aliases"
+
+    alias = Column(String(255), primary_key=True)
+    software_id = Column(Integer, ForeignKey("software_catalog.id", ondelete="CASCADE"), nullable=False, index=True)
+
+
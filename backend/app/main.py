@@ -3,19 +3,21 @@ Main FastAPI application.
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
 from app.db.database import Base, engine
 from app.api.routes import auth_routes, ci_routes, dashboard_routes, import_routes, export_routes, health_routes, domain_routes, user_routes, relationship_routes, cost_routes, software_routes, ai_routes
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     print("DEBUG: Lifespan startup called")
+    if settings.AUTO_CREATE_SCHEMA:
+        # Create database tables; one connection for all existence checks
+        with engine.begin() as connection:
+            Base.metadata.create_all(bind=connection, checkfirst=True)
     from app.core.scheduler import start_scheduler
     start_scheduler()
     yield
@@ -28,7 +30,9 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes the large list/dashboard payloads (datetimes, enums, raw_data) much faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -1,11 +1,10 @@
 """
 Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from app.db.models import CIStatus, CIType, RelationType, UserRole
-from pydantic import BaseModel, EmailStr, Field, field_validator
 import json
 
 
@@ -32,8 +31,7 @@ class UserResponse(UserBase):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -45,10 +43,6 @@ class TokenData(BaseModel):
     username: Optional[str] = None
 
 
-    class Config:
-        from_attributes = True
-
-
 # Software Catalog Schemas
 class SoftwareCatalogBase(BaseModel):
     name: str
@@ -71,8 +65,7 @@ class SoftwareCatalogResponse(SoftwareCatalogBase):
     updated_at: Optional[datetime]
     ci_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SoftwareCatalogNested(BaseModel):
@@ -82,8 +75,7 @@ class SoftwareCatalogNested(BaseModel):
     publisher: Optional[str] = None
     # Exclude aliases to avoid JSON serialization issues
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MatchRequest(BaseModel):
@@ -91,6 +83,36 @@ class MatchRequest(BaseModel):
     string_to_match: str
 
 
+def _parse_json_field(v):
+    """Parse JSON stored as text (legacy rows), turning NaN into None."""
+    if isinstance(v, str):
+        try:
+            if not v.strip():
+                return None
+            import math
+            def clean_nans(obj):
+                if isinstance(obj, float) and math.isnan(obj):
+                    return None
+                if isinstance(obj, dict):
+                    return {k: clean_nans(v) for k, v in obj.items()}
+                if isinstance(obj, list):
+                    return [clean_nans(x) for x in obj]
+                return obj
+            
+            parsed = json.loads(v)
+            return clean_nans(parsed)
+        except ValueError:
+            return {}
+    return v
+
+
+def _dump_json_text(v):
+    # Stored as JSON(B); the API keeps exposing it as a JSON string
+    if v is None or isinstance(v, str):
+        return v
+    return json.dumps(v)
+
+
 # Configuration Item Schemas
 class CIBase(BaseModel):
     name: str
@@ -145,28 +167,35 @@ class CIResponse(CIBase):
     @field_validator('raw_data', 'patch_summary', mode='before')
     @classmethod
     def parse_json_fields(cls, v):
-        if isinstance(v, str):
-            try:
-                if not v.strip():
-                    return None
-                import math
-                def clean_nans(obj):
-                    if isinstance(obj, float) and math.isnan(obj):
-                        return None
-                    if isinstance(obj, dict):
-                        return {k: clean_nans(v) for k, v in obj.items()}
-                    if isinstance(obj, list):
-                        return [clean_nans(x) for x in obj]
-                    return obj
-                
-                parsed = json.loads(v)
-                return clean_nans(parsed)
-            except ValueError:
-                return {}
-        return v
+        return _parse_json_field(v)
+
+    @field_validator('technical_details', mode='before')
+    @classmethod
+    def dump_technical_details(cls, v):
+        return _dump_json_text(v)
+
+    @classmethod
+    def from_trusted(cls, ci) -> "CIResponse":
+        """
+        Build a response from a ConfigurationItem loaded from the database without validation.
+        Only for ORM rows; user input must go through normal validation.
+        """
+        values = {name: getattr(ci, name) for name in cls.model_fields if name != 'software'}
+        values['raw_data'] = _parse_json_field(values['raw_data'])
+        values['patch_summary'] = _parse_json_field(values['patch_summary'])
+        values['technical_details'] = _dump_json_text(values['technical_details'])
+        if ci.software is not None:
+            values['software'] = SoftwareCatalogNested.model_construct(
+                id=ci.software.id,
+                name=ci.software.name,
+                version=ci.software.version,
+                publisher=ci.software.publisher
+            )
+        else:
+            values['software'] = None
+        return cls.model_construct(**values)
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 
@@ -186,8 +215,7 @@ class RelationshipResponse(RelationshipBase):
     id: int
     created_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class RelationshipDetailedResponse(RelationshipResponse):
@@ -210,12 +238,13 @@ class ImportLogResponse(BaseModel):
     details: Optional[str] = None
     started_at: datetime
     completed_at: Optional[datetime] = None
-    
-    class Config:
-        from_attributes = True
 
-    class Config:
-        from_attributes = True
+    @field_validator('details', mode='before')
+    @classmethod
+    def dump_details(cls, v):
+        return _dump_json_text(v)
+    
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Import Source Schemas
@@ -226,6 +255,11 @@ class ImportSourceBase(BaseModel):
     is_active: bool = True
     schedule_cron: Optional[str] = None
 
+    @field_validator('config', mode='before')
+    @classmethod
+    def dump_config(cls, v):
+        return _dump_json_text(v)
+
 
 class ImportSourceCreate(ImportSourceBase):
     pass
@@ -238,8 +272,7 @@ class ImportSourceResponse(ImportSourceBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ImportConfigCheck(BaseModel):
     source_type: str
@@ -288,8 +321,7 @@ class DomainResponse(DomainBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Cost Rule Schemas
@@ -318,5 +350,4 @@ class CostRuleResponse(CostRuleBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
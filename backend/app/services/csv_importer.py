@@ -1,14 +1,45 @@
 """
 CSV import service for bulk data import.
 """
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from app.db.models import ConfigurationItem, ImportLog, CIType, CIStatus
 from app.schemas import CICreate
 import json
 
+# Rows read, prepared and committed per step
+CSV_CHUNK_SIZE = 10_000
+
+# Lower-cased CSV value -> enum member, for the row-by-row fallback
+_CI_TYPE_MAP = {member.value: member for member in CIType}
+_STATUS_MAP = {member.value: member for member in CIStatus}
+
+# Categories in member order, so category codes index straight into the member tuples
+_CI_TYPES = tuple(CIType)
+_CI_TYPE_DTYPE = pd.CategoricalDtype([member.value for member in _CI_TYPES])
+_STATUSES = tuple(CIStatus)
+_STATUS_DTYPE = pd.CategoricalDtype([member.value for member in _STATUSES])
+
+
+def _enum_column(series: pd.Series, dtype: pd.CategoricalDtype, members: tuple, default) -> pd.Series:
+    """Map a text column to enum members through categorical codes; unknown values get the default."""
+    codes = series.astype(str).str.lower().astype(dtype).cat.codes.to_numpy()
+    # Unknown values have code -1, which picks the default appended at the end
+    lookup = np.array(members + (default,), dtype=object)
+    return pd.Series(lookup[codes], index=series.index)
+
+
+def _parse_json_text(value: str) -> Any:
+    """Bulk writes bypass the model validator, so JSON text is parsed here; other text is kept."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
 
 class CSVImporter:
     """Service for importing configuration items from CSV files."""
@@ -30,76 +61,47 @@ class CSVImporter:
         self.db.commit()
         
         try:
-            # Read CSV file
-            df = pd.read_csv(file_path)
-            
-            # Validate required columns
-            required_columns = ['name', 'ci_type']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {', '.join(missing_columns)}. For files with different headers, please use 'New Source' -> 'CSV File' which supports field mapping.")
-            
-            # Process each row
             records_processed = 0
             records_success = 0
             records_failed = 0
             errors = []
             
-            for index, row in df.iterrows():
-                records_processed += 1
+            # Stream the file in chunks so memory stays bounded. Everything is committed once at the
+            # end; each chunk is written in a SAVEPOINT, and if that fails the chunk is retried
+            # row by row so only the offending rows are lost.
+            for chunk in pd.read_csv(file_path, chunksize=CSV_CHUNK_SIZE):
+                # Validate required columns
+                required_columns = ['name', 'ci_type']
+                missing_columns = [col for col in required_columns if col not in chunk.columns]
+                
+                if missing_columns:
+                    raise ValueError(f"Missing required columns: {', '.join(missing_columns)}. For files with different headers, please use 'New Source' -> 'CSV File' which supports field mapping.")
                 
+                records_processed += len(chunk)
                 try:
-                    # Prepare CI data
-                    ci_data = self._prepare_ci_data(row)
-                    
-                    # Check if CI already exists (by name and type)
-                    existing_ci = self.db.query(ConfigurationItem).filter(
-                        ConfigurationItem.name == ci_data['name'],
-                        ConfigurationItem.ci_type == ci_data['ci_type'],
-                        ConfigurationItem.deleted_at.is_(None)
-                    ).first()
-                    
-                    if existing_ci:
-                        # Update existing CI
-                        # Handle raw_data merging separately before the loop
-                        if 'raw_data' in ci_data:
-                            new_raw_section = json.loads(ci_data['raw_data'])
-                            current_raw = {}
-                            if existing_ci.raw_data:
-                                try:
-                                    # Load existing
-                                    if isinstance(existing_ci.raw_data, str):
-                                        current_raw = json.loads(existing_ci.raw_data)
-                                    else:
-                                        current_raw = existing_ci.raw_data
-                                        
-                                    # Handle legacy/malformed
-                                    if not isinstance(current_raw, dict):
-                                        current_raw = {}
-                                except:
-                                    current_raw = {}
-                            
-                            # Merge 'csv' section
-                            current_raw['csv'] = new_raw_section.get('csv', {})
-                            ci_data['raw_data'] = json.dumps(current_raw, default=str)
-
-                        for key, value in ci_data.items():
-                            if value is not None:
-                                setattr(existing_ci, key, value)
-                    else:
-                        # Create new CI
-                        new_ci = ConfigurationItem(**ci_data)
-                        self.db.add(new_ci)
-                    
-                    records_success += 1
-                    
+                    # Prepare all rows with column operations, then write them in bulk
+                    records, chunk_errors = self._prepare_records(chunk)
                 except Exception as e:
-                    records_failed += 1
-                    errors.append(f"Row {index + 2}: {str(e)}")
-            
-            # Commit all changes
-            self.db.commit()
+                    records_failed += len(chunk)
+                    errors.append(f"Rows {chunk.index[0] + 2}-{chunk.index[-1] + 2}: {str(e)}")
+                    continue
+                records_failed += len(chunk_errors)
+                errors.extend(chunk_errors)
+
+                try:
+                    with self.db.begin_nested():
+                        # Copies, so a failed attempt leaves no merged values behind for the retry
+                        self._upsert_records([dict(record) for record in records])
+                    records_success += len(records)
+                except Exception:
+                    for record in records:
+                        try:
+                            with self.db.begin_nested():
+                                self._upsert_records([record])
+                            records_success += 1
+                        except Exception as e:
+                            records_failed += 1
+                            errors.append(f"CI '{record['name']}' ({record['ci_type'].value}): {str(e)}")
             
             # Update import log
             import_log.status = "success" if records_failed == 0 else "partial"
@@ -117,56 +119,136 @@ class CSVImporter:
         self.db.commit()
         return import_log
     
+    def _prepare_records(self, df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Build CI column values for all rows at once.
+        Rows failing validation are reported from a mask; only if the frame cannot be
+        converted as a whole are rows prepared one by one.
+        """
+        # Replace NaN/NaT with None once for the whole chunk; both paths read native values
+        df = df.astype(object).where(pd.notna(df), None)
+
+        bad_mask = df['name'].isna()
+        errors = [f"Row {index + 2}: Missing value for 'name'" for index in df.index[bad_mask]]
+        if bad_mask.any():
+            df = df[~bad_mask]
+
+        try:
+            return self._prepare_frame(df), errors
+        except Exception:
+            records = []
+            for index, row in df.iterrows():
+                try:
+                    records.append(self._prepare_ci_data(row))
+                except Exception as e:
+                    errors.append(f"Row {index + 2}: {str(e)}")
+            return records, errors
+
+    def _prepare_frame(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Vectorized equivalent of _prepare_ci_data for a whole DataFrame (NaN already replaced by None)."""
+        def optional_str(column: str) -> pd.Series:
+            if column not in df.columns:
+                return pd.Series(None, index=df.index, dtype=object)
+            return df[column].map(str, na_action='ignore').astype(object).where(df[column].notna(), None)
+
+        department = optional_str('department')
+        prepared = pd.DataFrame({
+            'name': df['name'].astype(str),
+            'ci_type': _enum_column(df['ci_type'], _CI_TYPE_DTYPE, _CI_TYPES, CIType.OTHER),
+            'status': (
+                _enum_column(df['status'], _STATUS_DTYPE, _STATUSES, CIStatus.ACTIVE)
+                if 'status' in df.columns else CIStatus.ACTIVE
+            ),
+            'description': optional_str('description'),
+            'department': department.where(department.notna(), optional_str('owner')),
+            'location': optional_str('location'),
+            'environment': optional_str('environment'),
+            'cost_center': optional_str('cost_center'),
+            'sla': optional_str('sla'),
+        }, index=df.index)
+
+        records = prepared.astype(object).where(prepared.notna(), None).to_dict(orient='records')
+        technical_details = optional_str('technical_details').tolist()
+        for ci_data, details, raw_record in zip(records, technical_details, df.to_dict(orient='records')):
+            if details is not None:
+                ci_data['technical_details'] = _parse_json_text(details)
+            ci_data['raw_data'] = {'csv': raw_record}
+        return records
+
+    def _upsert_records(self, records: List[Dict[str, Any]]):
+        """Insert new CIs and update existing ones (matched by name and type) in bulk."""
+        keys = list({(r['name'], r['ci_type']) for r in records})
+        existing = {}
+        for i in range(0, len(keys), 1000):
+            rows = self.db.query(
+                ConfigurationItem.id, ConfigurationItem.name, ConfigurationItem.ci_type, ConfigurationItem.raw_data
+            ).filter(
+                tuple_(ConfigurationItem.name, ConfigurationItem.ci_type).in_(keys[i:i + 1000]),
+                ConfigurationItem.deleted_at.is_(None)
+            ).all()
+            for row in rows:
+                existing[(row.name, row.ci_type)] = row
+
+        inserts: Dict[Tuple[str, CIType], Dict[str, Any]] = {}
+        updates = []
+        for ci_data in records:
+            key = (ci_data['name'], ci_data['ci_type'])
+            if key in existing:
+                row = existing[key]
+                ci_data['raw_data'] = self._merge_raw_data(row.raw_data, ci_data['raw_data'])
+                update = {k: v for k, v in ci_data.items() if v is not None}
+                update['id'] = row.id
+                updates.append(update)
+            elif key in inserts:
+                # Repeated rows in the file update the pending insert instead of creating a duplicate
+                inserts[key].update({k: v for k, v in ci_data.items() if v is not None})
+            else:
+                inserts[key] = ci_data
+
+        if inserts:
+            self.db.bulk_insert_mappings(ConfigurationItem, list(inserts.values()))
+        if updates:
+            self.db.bulk_update_mappings(ConfigurationItem, updates)
+
+    def _merge_raw_data(self, current_raw: Any, new_raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the 'csv' section of an existing CI's raw_data, keeping other sources."""
+        # Handle legacy/malformed
+        if not isinstance(current_raw, dict):
+            current_raw = {}
+        return {**current_raw, 'csv': new_raw_data.get('csv', {})}
+
     def _prepare_ci_data(self, row: pd.Series) -> Dict[str, Any]:
-        """Prepare CI data from CSV row."""
-        # Map CI type string to enum
-        ci_type_map = {
-            'server': CIType.SERVER,
-            'application': CIType.APPLICATION,
-            'network_device': CIType.NETWORK_DEVICE,
-            'database': CIType.DATABASE,
-            'workstation': CIType.WORKSTATION,
-            'storage': CIType.STORAGE,
-            'other': CIType.OTHER
-        }
-        
-        # Map status string to enum
-        status_map = {
-            'active': CIStatus.ACTIVE,
-            'inactive': CIStatus.INACTIVE,
-            'retired': CIStatus.RETIRED,
-            'planned': CIStatus.PLANNED,
-            'maintenance': CIStatus.MAINTENANCE
-        }
-        
+        """Prepare CI data from a CSV row whose NaN values were already replaced by None."""
+        def optional_str(column: str) -> Optional[str]:
+            value = row.get(column)
+            return str(value) if value is not None else None
+
         ci_type_str = str(row.get('ci_type', '')).lower()
         status_str = str(row.get('status', 'active')).lower()
         
         ci_data = {
             'name': str(row['name']),
-            'ci_type': ci_type_map.get(ci_type_str, CIType.OTHER),
-            'status': status_map.get(status_str, CIStatus.ACTIVE),
-            'description': str(row['description']) if pd.notna(row.get('description')) else None,
-            'department': str(row['department']) if 'department' in row and pd.notna(row['department']) else (str(row['owner']) if 'owner' in row and pd.notna(row['owner']) else None),
-            'location': str(row['location']) if pd.notna(row.get('location')) else None,
-            'environment': str(row['environment']) if pd.notna(row.get('environment')) else None,
-            'cost_center': str(row['cost_center']) if pd.notna(row.get('cost_center')) else None,
-            'sla': str(row['sla']) if pd.notna(row.get('sla')) else None,
+            'ci_type': _CI_TYPE_MAP.get(ci_type_str, CIType.OTHER),
+            'status': _STATUS_MAP.get(status_str, CIStatus.ACTIVE),
+            'description': optional_str('description'),
+            'department': optional_str('department') or optional_str('owner'),
+            'location': optional_str('location'),
+            'environment': optional_str('environment'),
+            'cost_center': optional_str('cost_center'),
+            'sla': optional_str('sla'),
         }
         
         # Handle technical details (could be JSON string or individual columns)
-        if 'technical_details' in row and pd.notna(row['technical_details']):
-            ci_data['technical_details'] = str(row['technical_details'])
+        technical_details = optional_str('technical_details')
+        if technical_details is not None:
+            ci_data['technical_details'] = _parse_json_text(technical_details)
 
         # Capture raw data (full row)
-        # Convert to dict and handle NaN/NaT
-        raw_record = row.where(pd.notnull(row), None).to_dict()
-        
         # Prepare sectioned raw data
         # For CSV imports via this service, we use 'csv' as the section key
         initial_raw_data = {
-            'csv': raw_record
+            'csv': row.to_dict()
         }
-        ci_data['raw_data'] = json.dumps(initial_raw_data, default=str)
+        ci_data['raw_data'] = initial_raw_data
         
         return ci_data
@@ -1,7 +1,101 @@
+import asyncio
+import ipaddress
 import socket
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.db.models import ConfigurationItem, Domain
 
+# Concurrent DNS lookups (the per-lookup timeout is settings.DNS_TIMEOUT)
+DNS_CONCURRENCY = 64
+# Positive and negative (NXDOMAIN) results are reused across CIs and reruns for a short while
+DNS_CACHE_TTL = 300
+DNS_CACHE_MAXSIZE = 10_000
+
+# fqdn -> (expires_at, resolved)
+_dns_cache: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+
+def _is_ip_address(name: str) -> bool:
+    """IP-literal CI names have no domain to find."""
+    try:
+        ipaddress.ip_address(name)
+        return True
+    except ValueError:
+        return False
+
+def _configured_domain(name: str, domain_names: List[str]) -> Optional[str]:
+    """The first configured domain the name already ends in, if any."""
+    return next((domain for domain in domain_names if name.endswith(f".{domain}")), None)
+
+def _release_lookup(semaphore: asyncio.Semaphore, future: asyncio.Future):
+    """Free a lookup slot once its thread is done; the result was already consumed or given up on."""
+    semaphore.release()
+    if not future.cancelled():
+        future.exception()  # Marks a late error as retrieved so it is not logged
+
+async def _resolve(loop, semaphore: asyncio.Semaphore, fqdn: str) -> Optional[bool]:
+    """Returns True if the name resolves, False if it does not, None on timeouts and unexpected errors."""
+    await semaphore.acquire()
+    # One socket type so the resolver builds a single result entry per address
+    future = loop.run_in_executor(
+        None, partial(socket.getaddrinfo, fqdn, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+    )
+    # getaddrinfo cannot be interrupted, so a timed-out lookup keeps its worker thread.
+    # The slot is only freed once the thread is done: there are never more lookups
+    # submitted than threads, and each timeout runs from when its lookup starts
+    # rather than from when it was queued behind a stuck one.
+    future.add_done_callback(partial(_release_lookup, semaphore))
+    try:
+        await asyncio.wait_for(asyncio.shield(future), settings.DNS_TIMEOUT)
+        return True
+    except socket.gaierror:
+        return False
+    except Exception:
+        # Includes asyncio.TimeoutError: a slow resolver says nothing about the name,
+        # so it is neither cached nor reported as non-resolving
+        return None
+
+async def _resolve_fqdns(loop, semaphore: asyncio.Semaphore, fqdns: Set[str]) -> Dict[str, Optional[bool]]:
+    """Resolve a set of FQDNs concurrently, answering from the cache where possible."""
+    now = time.monotonic()
+    results = {}
+    for fqdn in fqdns:
+        cached = _dns_cache.get(fqdn)
+        if cached and cached[0] > now:
+            results[fqdn] = cached[1]
+
+    pending = [fqdn for fqdn in fqdns if fqdn not in results]
+    resolved = await asyncio.gather(*(_resolve(loop, semaphore, fqdn) for fqdn in pending))
+
+    for fqdn, result in zip(pending, resolved):
+        results[fqdn] = result
+        if result is not None:  # Errors are retried next time
+            _dns_cache[fqdn] = (now + DNS_CACHE_TTL, result)
+            _dns_cache.move_to_end(fqdn)
+    while len(_dns_cache) > DNS_CACHE_MAXSIZE:
+        _dns_cache.popitem(last=False)
+    return results
+
+async def _resolve_all(names: List[str], domain_names: List[str]) -> Tuple[Dict[str, Optional[bool]], Dict[str, Optional[bool]]]:
+    """
+    Resolve names that already end in a configured domain as-is, then every remaining
+    name against every domain suffix. Returns (direct results, suffixed results) keyed by FQDN.
+    """
+    loop = asyncio.get_running_loop()
+    # getaddrinfo runs in the loop's executor; size it to the concurrency limit
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=DNS_CONCURRENCY))
+    semaphore = asyncio.Semaphore(DNS_CONCURRENCY)
+
+    direct = await _resolve_fqdns(loop, semaphore, {name for name in names if _configured_domain(name, domain_names)})
+    suffixed = await _resolve_fqdns(loop, semaphore, {
+        f"{name}.{domain}" for name in names if not direct.get(name) for domain in domain_names
+    })
+    return direct, suffixed
+
 def resolve_domains_for_cis(db: Session, limit: int = 50):
     """
     Iterates through CIs and attempts to resolve their DNS using active domains.
@@ -28,22 +122,23 @@ def resolve_domains_for_cis(db: Session, limit: int = 50):
         
         stats["processed"] = len(cis)
 
+        # All lookups run concurrently; this function stays synchronous for its callers
+        domain_names = [domain.name for domain in domains]
+        cis = [ci for ci in cis if not _is_ip_address(ci.name)]
+        direct, suffixed = asyncio.run(_resolve_all([ci.name for ci in cis], domain_names))
+
         for ci in cis:
-            resolved_domain = None
-            
-            # Try each domain suffix
-            for domain in domains:
-                fqdn = f"{ci.name}.{domain.name}"
-                try:
-                    # Try to resolve
-                    socket.gethostbyname(fqdn)
-                    resolved_domain = domain.name
-                    break # Stop after first success
-                except socket.gaierror:
-                    # Resolution failed
-                    pass
-                except Exception as e:
-                     stats["errors"] += 1
+            if direct.get(ci.name):
+                # Already an FQDN in a configured domain
+                resolved_domain = _configured_domain(ci.name, domain_names)
+            else:
+                if ci.name in direct and direct[ci.name] is None:
+                    stats["errors"] += 1
+                ci_results = [suffixed[f"{ci.name}.{name}"] for name in domain_names]
+                stats["errors"] += sum(1 for result in ci_results if result is None)
+
+                # First domain suffix (in configured order) that resolves wins
+                resolved_domain = next((name for name, ok in zip(domain_names, ci_results) if ok), None)
             
             if resolved_domain:
                 if ci.domain != resolved_domain:
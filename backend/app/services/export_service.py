@@ -1,13 +1,30 @@
 """
 Export service for generating CI exports in various formats.
 """
+import csv
 import pandas as pd
+import orjson
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session, load_only
 from app.db.models import ConfigurationItem, CIType, CIStatus
 from datetime import datetime
 import json
 
+# Column headers of CSV/Excel exports and keys of JSON exports
+EXPORT_COLUMNS = [
+    'id', 'name', 'ci_type', 'status', 'description', 'Abteilung', 'location', 'environment',
+    'cost_center', 'service_provider', 'contact', 'technical_details', 'external_id',
+    'created_at', 'updated_at'
+]
+# Model attributes behind EXPORT_COLUMNS; the only columns exports load
+EXPORT_ATTRIBUTES = [
+    'id', 'name', 'ci_type', 'status', 'description', 'department', 'location', 'environment',
+    'cost_center', 'service_provider', 'contact', 'technical_details', 'external_id',
+    'created_at', 'updated_at'
+]
+# Rows fetched per round trip when streaming exports
+EXPORT_BATCH_SIZE = 1000
+
 
 class ExportService:
     """Service for exporting configuration items."""
@@ -23,8 +40,11 @@ class ExportService:
     ) -> str:
         """Export CIs to CSV file."""
         cis = self._get_cis(ci_type, status)
-        df = self._cis_to_dataframe(cis)
-        df.to_csv(output_path, index=False)
+        # Written straight from the rows; no intermediate DataFrame needed
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            writer.writerows(self._export_row(ci) for ci in cis.yield_per(EXPORT_BATCH_SIZE))
         return output_path
     
     def export_to_excel(
@@ -37,15 +57,15 @@ class ExportService:
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             # All CIs
             cis = self._get_cis(ci_type, status)
-            df_all = self._cis_to_dataframe(cis)
+            df_all = self._cis_to_dataframe(cis.yield_per(EXPORT_BATCH_SIZE))
             df_all.to_excel(writer, sheet_name='All CIs', index=False)
             
-            # CIs by type (if no specific type filter)
+            # CIs by type (if no specific type filter), split from the same rows in CIType order
             if not ci_type:
+                type_groups = dict(tuple(df_all.groupby('ci_type', sort=False)))
                 for ci_type_enum in CIType:
-                    type_cis = self._get_cis(ci_type_enum, status)
-                    if type_cis:
-                        df_type = self._cis_to_dataframe(type_cis)
+                    df_type = type_groups.get(ci_type_enum.value)
+                    if df_type is not None:
                         sheet_name = ci_type_enum.value.replace('_', ' ').title()[:31]  # Excel limit
                         df_type.to_excel(writer, sheet_name=sheet_name, index=False)
         
@@ -60,30 +80,15 @@ class ExportService:
         """Export CIs to JSON file."""
         cis = self._get_cis(ci_type, status)
         
-        data = []
-        for ci in cis:
-            ci_dict = {
-                'id': ci.id,
-                'name': ci.name,
-                'ci_type': ci.ci_type.value,
-                'status': ci.status.value,
-                'description': ci.description,
-                'Abteilung': ci.department,
-                'location': ci.location,
-                'environment': ci.environment,
-                'environment': ci.environment,
-                'cost_center': ci.cost_center,
-                'service_provider': ci.service_provider,
-                'contact': ci.contact,
-                'technical_details': ci.technical_details,
-                'external_id': ci.external_id,
-                'created_at': ci.created_at.isoformat() if ci.created_at else None,
-                'updated_at': ci.updated_at.isoformat() if ci.updated_at else None
-            }
-            data.append(ci_dict)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Stream one array element per CI instead of building the whole list first
+        with open(output_path, 'wb') as f:
+            f.write(b'[')
+            for i, ci in enumerate(cis.yield_per(EXPORT_BATCH_SIZE)):
+                ci_dict = dict(zip(EXPORT_COLUMNS, self._export_row(ci, flatten_json=False)))
+                # orjson writes compact UTF-8 and serializes datetimes natively
+                f.write(b',\n' if i else b'\n')
+                f.write(orjson.dumps(ci_dict))
+            f.write(b'\n]\n')
         
         return output_path
     
@@ -91,9 +96,11 @@ class ExportService:
         self,
         ci_type: Optional[CIType] = None,
         status: Optional[CIStatus] = None
-    ) -> List[ConfigurationItem]:
-        """Get CIs with optional filters."""
-        query = self.db.query(ConfigurationItem).filter(
+    ) -> Query:
+        """Query for CIs with optional filters, loading only the exported columns."""
+        query = self.db.query(ConfigurationItem).options(
+            load_only(*(getattr(ConfigurationItem, column) for column in EXPORT_ATTRIBUTES))
+        ).filter(
             ConfigurationItem.deleted_at.is_(None)
         )
         
@@ -103,29 +110,33 @@ class ExportService:
         if status:
             query = query.filter(ConfigurationItem.status == status)
         
-        return query.all()
+        return query
     
+    def _export_row(self, ci: ConfigurationItem, flatten_json: bool = True) -> tuple:
+        """
+        Values of one CI in EXPORT_COLUMNS order.
+        With flatten_json, technical_details is serialized to text for tabular formats.
+        """
+        return (
+            ci.id,
+            ci.name,
+            ci.ci_type.value,
+            ci.status.value,
+            ci.description,
+            ci.department,
+            ci.location,
+            ci.environment,
+            ci.cost_center,
+            ci.service_provider,
+            ci.contact,
+            json.dumps(ci.technical_details) if flatten_json and ci.technical_details is not None else ci.technical_details,
+            ci.external_id,
+            ci.created_at,
+            ci.updated_at
+        )
+
     def _cis_to_dataframe(self, cis: List[ConfigurationItem]) -> pd.DataFrame:
-        """Convert CIs to pandas DataFrame."""
-        data = []
-        for ci in cis:
-            data.append({
-                'id': ci.id,
-                'name': ci.name,
-                'ci_type': ci.ci_type.value,
-                'status': ci.status.value,
-                'description': ci.description,
-                'Abteilung': ci.department,
-                'location': ci.location,
-                'environment': ci.environment,
-                'environment': ci.environment,
-                'cost_center': ci.cost_center,
-                'service_provider': ci.service_provider,
-                'contact': ci.contact,
-                'technical_details': ci.technical_details,
-                'external_id': ci.external_id,
-                'created_at': ci.created_at,
-                'updated_at': ci.updated_at
-            })
-        
-        return pd.DataFrame(data)
+        """Convert CIs to pandas DataFrame, built column by column."""
+        rows = [self._export_row(ci) for ci in cis]
+        columns = zip(*rows) if rows else ([] for _ in EXPORT_COLUMNS)
+        return pd.DataFrame(dict(zip(EXPORT_COLUMNS, map(list, columns))), columns=EXPORT_COLUMNS)
@@ -0,0 +1,35 @@
+"""
+Software catalog (DML) alias helpers.
+"""
+from typing import Dict, Iterable
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.db.models import SoftwareAlias, SoftwareCatalog
+
+
+def upsert_software_aliases(db: Session, aliases_by_id: Dict[int, Iterable[str]]):
+    """
+    Insert software_aliases rows for several catalog entries in one statement.
+    An alias already owned by another entry is moved to the new one (last writer wins).
+    """
+    rows = {}
+    for software_id, aliases in aliases_by_id.items():
+        for alias in aliases or []:
+            if alias and alias.strip():
+                rows[alias.strip()] = software_id
+    if rows:
+        stmt = pg_insert(SoftwareAlias).values([
+            {"alias": alias, "software_id": software_id} for alias, software_id in rows.items()
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[SoftwareAlias.alias],
+            set_={"software_id": stmt.excluded.software_id}
+        ))
+
+
+def sync_software_aliases(db: Session, software: SoftwareCatalog):
+    """Rewrite the software_aliases rows of a catalog entry from its aliases list."""
+    db.flush()  # Make sure the entry has an id
+    db.execute(delete(SoftwareAlias).where(SoftwareAlias.software_id == software.id))
+    upsert_software_aliases(db, {software.id: software.aliases})
@@ -0,0 +1,38 @@
+"""
+bcrypt cost factor calibration for the admin provisioning scripts.
+Picks the highest cost whose hash stays under a time budget on this machine and
+remembers it in backend/.bcrypt_rounds so later runs skip the calibration.
+"""
+import os
+import time
+import bcrypt
+
+ROUNDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bcrypt_rounds")
+MIN_ROUNDS = 8
+MAX_ROUNDS = 31
+
+def calibrate_bcrypt_rounds(max_ms=250):
+    """Return the highest cost factor whose hash time is below max_ms."""
+    rounds = MIN_ROUNDS
+    while rounds < MAX_ROUNDS:
+        start = time.perf_counter()
+        bcrypt.hashpw(b"x" * 16, bcrypt.gensalt(rounds + 1))
+        # Each extra round doubles the work, so stop before the next one goes over budget
+        if (time.perf_counter() - start) * 1000 >= max_ms:
+            break
+        rounds += 1
+    return rounds
+
+def get_bcrypt_rounds(max_ms=250):
+    """Return the cached cost factor, calibrating and caching it on first use."""
+    try:
+        with open(ROUNDS_FILE) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        pass
+
+    rounds = calibrate_bcrypt_rounds(max_ms)
+    with open(ROUNDS_FILE, "w") as f:
+        f.write(f"{rounds}\n")
+    print(f"Calibrated bcrypt cost factor: {rounds} (cached in {ROUNDS_FILE})")
+    return rounds
@@ -4,10 +4,16 @@ import os
 sys.path.append(os.getcwd())
 from app.db.database import SessionLocal
 from app.db.models import ImportLog
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 
 db = SessionLocal()
-last_log = db.query(ImportLog).order_by(desc(ImportLog.started_at)).first()
+# Plain row of the columns printed below; no ORM object needed for a status check
+last_log = db.execute(
+    select(
+        ImportLog.id, ImportLog.source, ImportLog.status, ImportLog.started_at,
+        ImportLog.completed_at, ImportLog.records_processed, ImportLog.details
+    ).order_by(desc(ImportLog.started_at)).limit(1)
+).first()
 
 if last_log:
     print(f"ID: {last_log.id}")
@@ -1,32 +1,42 @@
 import requests
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from api_token_cache import admin_get
 
 # Constants
 API_URL = "http://localhost:8000/api"
 ADMIN_USERNAME = "admin"
 ADMIN_PASSWORD = "adminpassword"
 
-def get_admin_token():
+def create_session():
+    """One keep-alive connection pool for all calls of this script."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+    return session
+
+def fetch_users(session):
     try:
-        response = requests.post(f"{API_URL}/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
-        response.raise_for_status()
-        return response.json()["access_token"]
+        return admin_get(session, API_URL, "/users", ADMIN_USERNAME, ADMIN_PASSWORD).json()
     except Exception as e:
         print(f"Failed to login as admin: {e}")
         return None
 
-def check_viewer_user():
-    # First, get admin token to check if user exists
-    token = get_admin_token()
-    if not token:
+def check_viewer_user(session):
+    # The user lookup (as admin) and the viewer login are independent; run both round-trips at once
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        users_future = executor.submit(fetch_users, session)
+        login_future = executor.submit(
+            session.post,
+            f"{API_URL}/auth/login",
+            data={"username": "viewer", "password": "viewerpassword"}
+        )
+        users = users_future.result()
+        login_res = login_future.result()
+    if users is None:
         return
     
-    headers = {"Authorization": f"Bearer {token}"}
-    
     print("\n1. Checking if 'viewer' user exists...")
-    res = requests.get(f"{API_URL}/users", headers=headers)
-    users = res.json()
-    
     viewer_user = next((u for u in users if u['username'] == 'viewer'), None)
     
     if viewer_user:
@@ -39,12 +49,8 @@ def check_viewer_user():
         print("✗ User 'viewer' not found in database")
         return
     
-    # Try to login as viewer
+    # Login as viewer (already sent above)
     print("\n2. Attempting to login as 'viewer' with password 'viewerpassword'...")
-    login_res = requests.post(
-        f"{API_URL}/auth/login",
-        data={"username": "viewer", "password": "viewerpassword"}
-    )
     
     if login_res.status_code == 200:
         print("✓ Login successful!")
@@ -60,4 +66,5 @@ def check_viewer_user():
             print("\n⚠️  User is INACTIVE - this may be the issue")
 
 if __name__ == "__main__":
-    check_viewer_user()
+    with create_session() as session:
+        check_viewer_user(session)
@@ -7,8 +7,9 @@ sys.path.append('/Users/andreasbeckmann/CMDBBoard/CMDBBoard/backend')
 from app.db.database import SessionLocal
 from app.db.models import User, UserRole
 from passlib.context import CryptContext
+from bcrypt_rounds import get_bcrypt_rounds
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=get_bcrypt_rounds())
 
 def create_admin():
     db = SessionLocal()
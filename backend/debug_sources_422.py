@@ -1,18 +1,17 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from api_token_cache import admin_get
 
-try:
-    # Login to get token
-    auth_response = requests.post(
-        "http://localhost:8000/api/auth/login",
-        data={"username": "admin", "password": "adminpassword"}
-    )
-    auth_response.raise_for_status()
-    token = auth_response.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
+API_URL = "http://localhost:8000/api"
+
+# One keep-alive connection for the login and the follow-up call
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
 
-    # Call sources endpoint
-    response = requests.get("http://localhost:8000/api/import/sources", headers=headers)
+try:
+    # Admin token is reused from the cache while still valid
+    response = admin_get(session, API_URL, "/import/sources", "admin", "adminpassword")
     
     print(f"Status Code: {response.status_code}")
     if response.status_code == 422:
@@ -24,3 +23,5 @@ try:
 
 except Exception as e:
     print(f"Error: {e}")
+finally:
+    session.close()
@@ -7,6 +7,7 @@ sys.path.append('/Users/andreasbeckmann/CMDBBoard/CMDBBoard/backend')
 from app.db.database import Base, engine, SessionLocal
 from app.db.models import User, UserRole
 import bcrypt
+from bcrypt_rounds import get_bcrypt_rounds
 
 def init_db():
     # Create all tables
@@ -21,7 +22,7 @@ def init_db():
         
         # Hash password using bcrypt directly
         password = "adminpassword".encode('utf-8')
-        hashed = bcrypt.hashpw(password, bcrypt.gensalt()).decode('utf-8')
+        hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds=get_bcrypt_rounds())).decode('utf-8')
         
         if admin:
             admin.hashed_password = hashed
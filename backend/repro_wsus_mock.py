@@ -11,6 +11,7 @@ sys.path.append(os.path.join(os.getcwd(), 'backend'))
 from app.db.database import Base
 from app.db.models import ConfigurationItem, CIType, CIStatus
 from app.core.config import settings
+from scripts._profiling import count_queries
 
 def mock_wsus_data():
     print("Connecting to DB...")
@@ -21,52 +22,58 @@ def mock_wsus_data():
     db = SessionLocal()
 
     try:
-        # Create a Mock Server with Critical Updates missing
-        mock_ci = ConfigurationItem(
-            name="WSUS-TEST-SERVER",
-            ci_type=CIType.SERVER,
-            status=CIStatus.ACTIVE,
-            description="Mock Server to test WSUS Patch indicators",
-            department="IT - Infrastructure",
-            patch_summary={
-                "needed_critical": 5,
-                "needed_security": 12,
-                "last_sync": datetime.datetime.now().isoformat()
+        # One timestamp for both payloads; row timestamps come from the database clock
+        now_iso = datetime.datetime.now().isoformat()
+        wanted = {
+            # Mock Server with Critical Updates missing
+            "WSUS-TEST-SERVER": {
+                "description": "Mock Server to test WSUS Patch indicators",
+                "patch_summary": {
+                    "needed_critical": 5,
+                    "needed_security": 12,
+                    "last_sync": now_iso
+                }
             },
-            created_at=datetime.datetime.now(),
-            updated_at=datetime.datetime.now()
-        )
-        
-        # Check if exists
-        existing = db.query(ConfigurationItem).filter(ConfigurationItem.name == "WSUS-TEST-SERVER").first()
-        if existing:
-            print("Updating existing mock server...")
-            existing.patch_summary = mock_ci.patch_summary
-        else:
-            print("Creating new mock server...")
-            db.add(mock_ci)
-            
-        # Create a Fully Patched Server
-        patched_ci = ConfigurationItem(
-            name="WSUS-SECURE-SERVER",
-            ci_type=CIType.SERVER,
-            status=CIStatus.ACTIVE,
-            description="Mock Server - Fully Patched",
-            department="IT - Infrastructure",
-            patch_summary={
-                "needed_critical": 0,
-                "needed_security": 0,
-                "last_sync": datetime.datetime.now().isoformat()
-            },
-            created_at=datetime.datetime.now(),
-            updated_at=datetime.datetime.now()
-        )
-        
-        existing_secure = db.query(ConfigurationItem).filter(ConfigurationItem.name == "WSUS-SECURE-SERVER").first()
-        if existing_secure:
-            existing_secure.patch_summary = patched_ci.patch_summary
-        else:
-            db.add(patched_ci)
+            # Fully Patched Server
+            "WSUS-SECURE-SERVER": {
+                "description": "Mock Server - Fully Patched",
+                "patch_summary": {
+                    "needed_critical": 0,
+                    "needed_security": 0,
+                    "last_sync": now_iso
+                }
+            }
+        }
+
+        # One existence check for both mock servers (live servers of these names)
+        with count_queries(db.connection(), max_queries=3):
+            rows = db.query(ConfigurationItem).filter(
+                ConfigurationItem.name.in_(wanted),
+                ConfigurationItem.ci_type == CIType.SERVER,
+                ConfigurationItem.deleted_at.is_(None)
+            ).all()
+            existing = {row.name: row for row in rows}
+
+            for name, payload in wanted.items():
+                if name in existing:
+                    print(f"Updating existing mock server {name}...")
+                    # updated_at is set by the column's onupdate
+                    existing[name].patch_summary = payload["patch_summary"]
+                else:
+                    print(f"Creating new mock server {name}...")
+                    # created_at has a server default
+                    db.add(ConfigurationItem(
+                        name=name,
+                        ci_type=CIType.SERVER,
+                        status=CIStatus.ACTIVE,
+                        description=payload["description"],
+                        department="IT - Infrastructure",
+                        patch_summary=payload["patch_summary"]
+                    ))
+
+            # Guard against the mock regressing into per-row lookups (checked with CMDB_PROFILE=1):
+            # the lookup, at most one batched UPDATE and one batched INSERT
+            db.flush()
 
         db.commit()
         print("Mock Data Inserted Successfully!")
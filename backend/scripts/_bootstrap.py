@@ -0,0 +1,48 @@
+"""
+Shared setup for the maintenance scripts in this directory.
+Puts the backend on sys.path, provides a dummy SECRET_KEY when none is set and
+exposes one small engine and session factory for short-lived script runs.
+"""
+import contextlib
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
+
+# Set dummy SECRET_KEY for script execution if not present
+if not os.environ.get("SECRET_KEY"):
+    os.environ["SECRET_KEY"] = "script-dummy-key-super-secret"
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.database import json_serializer
+
+# Scripts use one connection at a time; the app's pool of 10 + 20 is not needed here.
+# Long-running scripts recycle connections before server/firewall idle timeouts hit.
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=2,
+    max_overflow=0,
+    pool_recycle=1800,
+    json_serializer=json_serializer
+)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@contextlib.contextmanager
+def session_scope():
+    """Yield a session that is committed on success, rolled back on error and always closed."""
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
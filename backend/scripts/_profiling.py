@@ -0,0 +1,31 @@
+"""
+Query counting for the maintenance scripts.
+Only active when CMDB_PROFILE is set, so normal runs pay nothing.
+"""
+import contextlib
+import os
+from sqlalchemy import event
+
+
+@contextlib.contextmanager
+def count_queries(conn, max_queries=None):
+    """
+    Record the SQL statements executed on conn inside the block.
+    With CMDB_PROFILE set, assert afterwards that at most max_queries were executed.
+    """
+    queries = []
+    if not os.getenv("CMDB_PROFILE"):
+        yield queries
+        return
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(conn, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(conn, "before_cursor_execute", before_cursor_execute)
+
+    if max_queries is not None:
+        assert len(queries) <= max_queries, f"{len(queries)} queries (max {max_queries}): {queries}"
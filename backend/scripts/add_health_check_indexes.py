@@ -0,0 +1,29 @@
+from sqlalchemy import text
+from _bootstrap import engine
+
+# Enum columns are stored by member name, hence 'RETIRED' rather than 'retired'.
+INDEXES = {
+    "ix_ci_type_status": "ON configuration_items (ci_type, status)",
+    "ix_ci_active_health": "ON configuration_items (id) WHERE status <> 'RETIRED'",
+    "ix_rel_source_target": "ON relationships (source_ci_id, target_ci_id)",
+    "ix_ci_name_type_active": "ON configuration_items (name, ci_type) WHERE deleted_at IS NULL",
+}
+
+def migrate():
+    print("Starting migration: Adding health check / relationship / import lookup indexes...")
+
+    if engine.dialect.name != "postgresql":
+        print("Partial indexes are only created on PostgreSQL. Skipping.")
+        return
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        for name, definition in INDEXES.items():
+            print(f"Creating index '{name}'...")
+            connection.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition};"))
+
+    print("Migration completed successfully.")
+
+if __name__ == "__main__":
+    migrate()
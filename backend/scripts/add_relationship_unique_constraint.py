@@ -0,0 +1,28 @@
+from sqlalchemy import text
+from _bootstrap import engine
+
+def migrate():
+    print("Starting migration: Adding unique constraint on relationships (source, target, type)...")
+
+    with engine.begin() as connection:
+        # Keep the oldest row of every duplicated edge so the constraint can be created
+        result = connection.execute(text("""
+            DELETE FROM relationships r
+            USING relationships d
+            WHERE r.source_ci_id = d.source_ci_id
+              AND r.target_ci_id = d.target_ci_id
+              AND r.relationship_type = d.relationship_type
+              AND r.id > d.id;
+        """))
+        print(f"Removed {result.rowcount} duplicate relationships.")
+
+        connection.execute(text("""
+            ALTER TABLE relationships DROP CONSTRAINT IF EXISTS uq_relationship_edge;
+            ALTER TABLE relationships
+                ADD CONSTRAINT uq_relationship_edge UNIQUE (source_ci_id, target_ci_id, relationship_type);
+        """))
+
+    print("Migration completed successfully.")
+
+if __name__ == "__main__":
+    migrate()
@@ -1,16 +1,5 @@
-
-import sys
-import os
-
-# Add the parent directory to the path so we can import the app
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Set dummy SECRET_KEY for script execution if not present
-if not os.environ.get("SECRET_KEY"):
-    os.environ["SECRET_KEY"] = "script-dummy-key-super-secret"
-
 from sqlalchemy import text, inspect
-from app.db.database import engine
+from _bootstrap import engine
 
 def migrate():
     print("Starting migration: Adding Software Catalog tables...")
@@ -1,50 +1,91 @@
-import sys
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from typing import List, Optional
+import re
+from sqlalchemy import select, func, case, and_, or_, true
 
-# Add backend to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from app.core.config import settings
+from _bootstrap import session_scope
 from app.db.models import ConfigurationItem, CostRule, CIType
 
 
-def normalize_os(os_name: str) -> str:
-    """Normalize OS name to generic categories."""
-    if not os_name:
-        return ""
-    
-    os_name = os_name.lower()
-    
-    # Linux
-    if any(x in os_name for x in ['ubuntu', 'debian', 'centos', 'redhat', 'fedora', 'suse', 'linux', 'rhel', 'aix']):
-        return "linux"
-    
-    # Windows Server
-    if any(x in os_name for x in ['windows server', 'windows 20']):
-        return "windows server"
-        
-    # Windows Client
-    if any(x in os_name for x in ['windows 1', 'windows 7', 'windows 8', 'windows xp', 'windows vista']):
-        return "windows client"
-        
-    return os_name
+# Generic OS categories and the (lowercase) substrings that identify them, checked in order
+OS_CATEGORIES = [
+    ("linux", ['ubuntu', 'debian', 'centos', 'redhat', 'fedora', 'suse', 'linux', 'rhel', 'aix']),
+    ("windows server", ['windows server', 'windows 20']),
+    ("windows client", ['windows 1', 'windows 7', 'windows 8', 'windows xp', 'windows vista']),
+]
 
-def check_cost_mappings():
-    engine = create_engine(str(settings.DATABASE_URL))
-    Session = sessionmaker(bind=engine)
-    session = Session()
+# One regular expression per category: a single scan of the OS name instead of one strpos per keyword
+OS_CATEGORY_PATTERNS = [
+    (category, "|".join(re.escape(keyword) for keyword in keywords))
+    for category, keywords in OS_CATEGORIES
+]
 
-    try:
-        # Get all Server CIs that are not deleted
-        server_cis = session.query(ConfigurationItem).filter(
-            ConfigurationItem.ci_type == CIType.SERVER,
-            ConfigurationItem.deleted_at.is_(None)
-        ).all()
-        
-        print(f"Total Server CIs: {len(server_cis)}")
+def normalize_os(os_name):
+    """SQL expression normalizing a lowercased OS name to generic categories."""
+    return case(
+        *[(os_name.regexp_match(pattern), category) for category, pattern in OS_CATEGORY_PATTERNS],
+        else_=os_name
+    )
+
+def build_mapping_query():
+    """Server CIs joined to the first cost rule they match (most specific rule wins)."""
+    # Rule-side strings are lowercased once per rule, not once per (CI, rule) pair
+    has_sla = func.coalesce(CostRule.sla, "") != ""
+    has_os = func.coalesce(CostRule.os_db_system, "") != ""
+    rules = select(
+        CostRule.id,
+        CostRule.sla,
+        CostRule.os_db_system,
+        func.lower(func.coalesce(CostRule.sla, "")).label("sla_lower"),
+        func.lower(func.trim(func.coalesce(CostRule.os_db_system, ""))).label("os_lower"),
+        has_sla.label("has_sla"),
+        has_os.label("has_os"),
+        (case((has_sla, 1), else_=0) + case((has_os, 1), else_=0)).label("specificity")
+    ).where(CostRule.ci_type == CIType.SERVER).cte("prepared_rules").prefix_with("MATERIALIZED")
+
+    # CI-side strings (and the normalized OS) are computed once per CI
+    ci_os_lower = func.lower(func.coalesce(ConfigurationItem.os_db_system, ""))
+    cis = select(
+        ConfigurationItem.name,
+        ConfigurationItem.sla,
+        ConfigurationItem.os_db_system,
+        func.lower(func.coalesce(ConfigurationItem.sla, "")).label("sla_lower"),
+        ci_os_lower.label("os_lower"),
+        normalize_os(ci_os_lower).label("os_normalized")
+    ).where(
+        ConfigurationItem.ci_type == CIType.SERVER,
+        ConfigurationItem.deleted_at.is_(None)
+    ).subquery("prepared_cis")
+
+    # SLA match (contains, either direction); a rule with an SLA never matches a CI without one
+    sla_match = or_(
+        ~rules.c.has_sla,
+        and_(
+            cis.c.sla_lower != "",
+            or_(func.strpos(cis.c.sla_lower, rules.c.sla_lower) > 0, func.strpos(rules.c.sla_lower, cis.c.sla_lower) > 0)
+        )
+    )
+    # OS match: direct/substring, or normalized (e.g. Rule "Linux" matches CI "AIX" -> "linux")
+    os_match = or_(
+        ~rules.c.has_os,
+        rules.c.os_lower == cis.c.os_lower,
+        and_(cis.c.os_lower != "", func.strpos(cis.c.os_lower, rules.c.os_lower) > 0),
+        rules.c.os_lower == cis.c.os_normalized
+    )
+
+    matched_rule = select(
+        rules.c.id, rules.c.sla, rules.c.os_db_system
+    ).where(sla_match, os_match).order_by(rules.c.specificity.desc(), rules.c.id).limit(1).lateral("matched_rule")
 
+    return select(
+        cis.c.name,
+        cis.c.sla,
+        cis.c.os_db_system,
+        matched_rule.c.id.label("rule_id"),
+        matched_rule.c.sla.label("rule_sla"),
+        matched_rule.c.os_db_system.label("rule_os_db_system")
+    ).select_from(cis).outerjoin(matched_rule, true())
+
+def check_cost_mappings():
+    with session_scope() as session:
         # Get all Cost Rules
         cost_rules = session.query(CostRule).filter(
             CostRule.ci_type == CIType.SERVER
@@ -53,76 +94,59 @@ def check_cost_mappings():
         print(f"Total Server Cost Rules: {len(cost_rules)}")
         for rule in cost_rules:
             print(f"  - Rule: SLA='{rule.sla}', OS='{rule.os_db_system}', Cost={rule.base_cost}")
+
+        # Matching happens in the database; rows are streamed in batches
+        rows = session.execute(build_mapping_query().execution_options(yield_per=1000))
         
-        unmapped_cis = []
-        mapped_generic = []
-        mapped_specific = []
+        output_file = "unmapped_servers.txt"
+        out = None
+        unmapped_sample = []
+        total_count = 0
+        unmapped_count = 0
+        mapped_generic_count = 0
+        mapped_specific_count = 0
         
-        for ci in server_cis:
-            matched_rule = None
-            
-            # Pre-calculate normalized OS for CI
-            normalized_ci_os = normalize_os(ci.os_db_system)
-
-            for rule in cost_rules:
-                # Check SLA match (contains)
-                if rule.sla and ci.sla:
-                    if rule.sla.lower() not in ci.sla.lower() and ci.sla.lower() not in rule.sla.lower():
-                        continue
-                elif rule.sla and not ci.sla:
-                    # Rule requires SLA, CI has none -> Mismatch
-                    continue
+        try:
+            for row in rows:
+                total_count += 1
                 
-                # Check OS match (contains OR normalized)
-                if rule.os_db_system:
-                    rule_os = rule.os_db_system.strip().lower()
-                    ci_os = (ci.os_db_system or "").lower()
-                    
-                    # Direct/Substring Match
-                    is_direct_match = rule_os == ci_os or (ci_os and rule_os in ci_os)
-                    
-                    # Normalized Match (e.g. Rule "Linux" matches CI "AIX" -> "linux")
-                    is_normalized_match = rule_os == normalized_ci_os
-                    
-                    if not is_direct_match and not is_normalized_match:
-                         continue
-                
-                matched_rule = rule
-                break
-            
-            if not matched_rule:
-                unmapped_cis.append(ci)
-            else:
-                # Is it generic? (No specific SLA/OS requirements)
-                if not matched_rule.sla and not matched_rule.os_db_system:
-                    mapped_generic.append(ci)
+                if row.rule_id is None:
+                    # Written as we go so the unmapped list never lives in memory
+                    if out is None:
+                        out = open(output_file, "w")
+                        out.write("Unmapped Server CIs\n")
+                        out.write("=" * 50 + "\n")
+                        out.write(f"{'Name':<30} | {'SLA':<15} | {'OS/DB System'}\n")
+                        out.write("-" * 50 + "\n")
+                    out.write(f"{row.name:<30} | {str(row.sla):<15} | {str(row.os_db_system)}\n")
+                    unmapped_count += 1
+                    if len(unmapped_sample) < 5:
+                        unmapped_sample.append((row.name, row.sla, row.os_db_system))
                 else:
-                    mapped_specific.append(ci)
+                    # Is it generic? (No specific SLA/OS requirements)
+                    if not row.rule_sla and not row.rule_os_db_system:
+                        mapped_generic_count += 1
+                    else:
+                        mapped_specific_count += 1
+        finally:
+            if out is not None:
+                out.write("-" * 50 + "\n")
+                out.write(f"{unmapped_count} total\n")
+                out.close()
 
+        print(f"Total Server CIs: {total_count}")
         print("-" * 30)
-        print(f"Mapped to Generic Rule: {len(mapped_generic)}")
-        print(f"Mapped to Specific Rule: {len(mapped_specific)}")
-        print(f"Not Mapped (No Rule): {len(unmapped_cis)}")
+        print(f"Mapped to Generic Rule: {mapped_generic_count}")
+        print(f"Mapped to Specific Rule: {mapped_specific_count}")
+        print(f"Not Mapped (No Rule): {unmapped_count}")
         print("-" * 30)
         
-        if len(unmapped_cis) > 0:
-            output_file = "unmapped_servers.txt"
-            with open(output_file, "w") as f:
-                f.write(f"Unmapped Server CIs ({len(unmapped_cis)} total)\n")
-                f.write("=" * 50 + "\n")
-                f.write(f"{'Name':<30} | {'SLA':<15} | {'OS/DB System'}\n")
-                f.write("-" * 50 + "\n")
-                for ci in unmapped_cis:
-                    f.write(f"{ci.name:<30} | {str(ci.sla):<15} | {str(ci.os_db_system)}\n")
-            
-            print(f"\nFull list of {len(unmapped_cis)} unmapped servers written to: {output_file}")
+        if unmapped_count > 0:
+            print(f"\nFull list of {unmapped_count} unmapped servers written to: {output_file}")
             
             print("Sample Unmapped CIs:")
-            for ci in unmapped_cis[:5]:
-                print(f"  - {ci.name} (SLA: {ci.sla}, OS: {ci.os_db_system})")
-
-    finally:
-        session.close()
+            for name, sla, os_db_system in unmapped_sample:
+                print(f"  - {name} (SLA: {sla}, OS: {os_db_system})")
 
 if __name__ == "__main__":
     check_cost_mappings()
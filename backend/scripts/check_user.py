@@ -1,9 +1,4 @@
-import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from app.db.database import SessionLocal
+from _bootstrap import SessionLocal
 from app.db.models import User
 
 def check_user():
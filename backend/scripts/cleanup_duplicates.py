@@ -1,66 +1,58 @@
-
 import sys
-import os
 from sqlalchemy import func, text
 
-# Add backend to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-from app.db.database import SessionLocal
+from _bootstrap import session_scope
+from _profiling import count_queries
 from app.db.models import ConfigurationItem
 
-def cleanup_duplicates():
-    db = SessionLocal()
+# Every CI but the most recently updated one (tie-breaker: highest ID) per name
+DUPLICATE_IDS = """
+    SELECT id FROM (
+        SELECT id, row_number() OVER (
+            PARTITION BY name
+            ORDER BY updated_at DESC NULLS LAST, id DESC
+        ) AS rn
+        FROM configuration_items
+    ) t
+    WHERE rn > 1
+"""
+
+def preview_duplicates(db):
+    """List names that have duplicates without deleting anything."""
+    duplicates = db.query(
+        ConfigurationItem.name, 
+        func.count(ConfigurationItem.id).label('count')
+    ).group_by(ConfigurationItem.name).having(func.count(ConfigurationItem.id) > 1).all()
+
+    if not duplicates:
+        print("No duplicates found.")
+        return
+
+    print(f"Found {len(duplicates)} names with duplicates.")
+    for name, count in duplicates:
+        print(f"  '{name}' (Count: {count}) -> {count - 1} would be removed")
+
+def cleanup_duplicates(dry_run=False):
+    print("Starting duplicate cleanup...")
     try:
-        print("Starting duplicate cleanup...")
-        
-        # 1. Find names that have duplicates
-        # Group by name, count > 1
-        duplicates_query = db.query(
-            ConfigurationItem.name, 
-            func.count(ConfigurationItem.id).label('count')
-        ).group_by(ConfigurationItem.name).having(func.count(ConfigurationItem.id) > 1)
-        
-        duplicates = duplicates_query.all()
-        
-        if not duplicates:
-            print("No duplicates found.")
-            return
+        with session_scope() as db:
+            # Preview is one query, the cleanup two statements (checked with CMDB_PROFILE=1)
+            with count_queries(db.connection(), max_queries=1 if dry_run else 2):
+                if dry_run:
+                    preview_duplicates(db)
+                    return
 
-        print(f"Found {len(duplicates)} names with duplicates.")
-        
-        total_removed = 0
-        
-        for name, count in duplicates:
-            print(f"Processing '{name}' (Count: {count})...")
-            
-            # Get all CIs with this name
-            cis = db.query(ConfigurationItem).filter(
-                ConfigurationItem.name == name
-            ).order_by(
-                ConfigurationItem.updated_at.desc(), # Keep most recently updated
-                ConfigurationItem.id.desc()          # Tie-breaker: keep highest ID
-            ).all()
-            
-            # Keep the first one (most recent), delete the rest
-            ci_to_keep = cis[0]
-            cis_to_remove = cis[1:]
-            
-            print(f"  Keeping ID: {ci_to_keep.id} (Updated: {ci_to_keep.updated_at})")
-            
-            for ci in cis_to_remove:
-                print(f"  Deleting ID: {ci.id} (Updated: {ci.updated_at})")
-                db.delete(ci)
-                total_removed += 1
-                
-        db.commit()
-        print(f"Cleanup complete. Removed {total_removed} duplicate records.")
+                # Relationships have no ON DELETE CASCADE in the database, so drop them first
+                db.execute(text(f"""
+                    DELETE FROM relationships
+                    WHERE source_ci_id IN ({DUPLICATE_IDS}) OR target_ci_id IN ({DUPLICATE_IDS})
+                """))
+                result = db.execute(text(f"DELETE FROM configuration_items WHERE id IN ({DUPLICATE_IDS}) RETURNING id"))
+
+        print(f"Cleanup complete. Removed {result.rowcount} duplicate records.")
         
     except Exception as e:
         print(f"Error during cleanup: {e}")
-        db.rollback()
-    finally:
-        db.close()
 
 if __name__ == "__main__":
-    cleanup_duplicates()
+    cleanup_duplicates(dry_run="--dry-run" in sys.argv[1:])
@@ -0,0 +1,67 @@
+from sqlalchemy import text
+from _bootstrap import engine
+
+# (table, column, GIN index name or None if the column is never searched)
+COLUMNS = [
+    ("configuration_items", "technical_details", "ix_ci_technical_gin"),
+    ("software_catalog", "aliases", "ix_software_aliases_gin"),
+    ("import_sources", "config", None),
+    ("import_logs", "details", None),
+    ("configuration_items", "raw_data", None),
+]
+
+def migrate():
+    print("Starting migration: Converting JSON text columns to JSONB...")
+
+    if engine.dialect.name != "postgresql":
+        print("JSONB is only available on PostgreSQL. Skipping.")
+        return
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+        try:
+            # Free-form text that is not valid JSON is kept as a JSON string
+            connection.execute(text("""
+                CREATE OR REPLACE FUNCTION pg_temp.try_jsonb(value TEXT) RETURNS JSONB AS $$
+                BEGIN
+                    RETURN value::jsonb;
+                EXCEPTION WHEN others THEN
+                    RETURN to_jsonb(value);
+                END;
+                $$ LANGUAGE plpgsql IMMUTABLE;
+            """))
+
+            for table, column, index_name in COLUMNS:
+                data_type = connection.execute(text(
+                    "SELECT data_type FROM information_schema.columns WHERE table_name = :table AND column_name = :column"
+                ), {"table": table, "column": column}).scalar()
+
+                if data_type == "jsonb":
+                    print(f"Column '{table}.{column}' is already JSONB.")
+                else:
+                    print(f"Converting '{table}.{column}' ({data_type}) to JSONB...")
+                    connection.execute(text(
+                        f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING pg_temp.try_jsonb({column}::text)"
+                    ))
+
+                # Values written as json.dumps() text into a JSON column were stored
+                # double-encoded; unwrap JSON strings that hold a JSON document
+                result = connection.execute(text(
+                    f"UPDATE {table} SET {column} = pg_temp.try_jsonb({column} #>> '{{}}') "
+                    f"WHERE jsonb_typeof({column}) = 'string' AND pg_temp.try_jsonb({column} #>> '{{}}') <> {column}"
+                ))
+                if result.rowcount:
+                    print(f"Unwrapped {result.rowcount} double-encoded values in '{table}.{column}'.")
+
+                if index_name:
+                    connection.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin ({column})"))
+                    print(f"Index '{index_name}' ensured.")
+
+            trans.commit()
+            print("Migration completed successfully.")
+        except Exception as e:
+            trans.rollback()
+            print(f"Error during migration: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,30 @@
+from sqlalchemy import text
+from _bootstrap import engine
+from app.db.models import SoftwareAlias
+
+def migrate():
+    print("Starting migration: Creating software_aliases lookup table...")
+
+    with engine.begin() as connection:
+        SoftwareAlias.__table__.create(bind=connection, checkfirst=True)
+
+        # Backfill from the JSONB aliases column; the lowest catalog id wins for shared aliases
+        result = connection.execute(text("""
+            INSERT INTO software_aliases (alias, software_id)
+            SELECT DISTINCT ON (alias) alias, id
+            FROM (
+                SELECT trim(a.value) AS alias, s.id
+                FROM software_catalog s
+                CROSS JOIN LATERAL jsonb_array_elements_text(s.aliases) AS a(value)
+                WHERE jsonb_typeof(s.aliases) = 'array'
+            ) src
+            WHERE alias <> ''
+            ORDER BY alias, id
+            ON CONFLICT (alias) DO NOTHING;
+        """))
+        print(f"Backfilled {result.rowcount} aliases.")
+
+    print("Migration completed successfully.")
+
+if __name__ == "__main__":
+    migrate()
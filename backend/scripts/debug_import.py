@@ -1,14 +1,10 @@
 import sys
-import os
 import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 
-# Add parent directory to path to import app modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from app.db.database import SessionLocal
-from app.db.database import SessionLocal
+from _bootstrap import SessionLocal
 from app.core.import_engine import ReconciliationService
 from app.db.models import ImportSource, ImportLog
 
@@ -26,11 +22,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=8)
+def get_source_id(source_type):
+    """ID of the first import source of a type, looked up once per process.
+    Only the ID is cached; ORM instances must not outlive their session."""
+    with SessionLocal() as db:
+        return db.query(ImportSource.id).filter(ImportSource.source_type == source_type).scalar()
+
 def debug_last_import():
     db = SessionLocal()
     try:
-        # Get the i-doit source
-        source = db.query(ImportSource).filter(ImportSource.source_type == 'idoit').first()
+        # Get the i-doit source (primary key lookup after the first call)
+        source_id = get_source_id('idoit')
+        source = db.get(ImportSource, source_id) if source_id is not None else None
         if not source:
             print("No i-doit import source found.")
             return
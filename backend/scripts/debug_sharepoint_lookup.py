@@ -1,16 +1,10 @@
 import sys
 import os
 import json
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+import time
+from sqlalchemy import text
 
-# Add backend to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from app.core.config import settings
-
-# Setup DB connection to get config
-engine = create_engine(str(settings.DATABASE_URL))
-SessionLocal = sessionmaker(bind=engine)
+from _bootstrap import SessionLocal
 
 def get_sharepoint_config():
     with SessionLocal() as db:
@@ -25,6 +19,49 @@ def get_sharepoint_config():
         print(f"Found SharePoint source ID: {row[0]}")
         return json.loads(row[1])
 
+# Item responses are cached on disk so repeated debug runs skip the SharePoint round-trips
+ITEM_CACHE_PATH = os.path.expanduser("~/.cmdb_sharepoint_item_cache.json")
+ITEM_CACHE_TTL = 600
+# Only the fields this script inspects; the lookup needs its sub-fields selected explicitly
+ITEM_SELECT = ["Id", "Title", "Datenbank_x0020_Version/Id", "Datenbank_x0020_Version/Title", "FieldValuesAsText"]
+ITEM_EXPAND = ["Datenbank_x0020_Version", "FieldValuesAsText"]
+
+def _load_item_cache():
+    try:
+        with open(ITEM_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def get_cached_item(site_url, list_name, item_id):
+    entry = _load_item_cache().get(f"{site_url}|{list_name}|{item_id}")
+    if entry and entry["expires_at"] > time.time():
+        return entry["properties"]
+    return None
+
+def cache_item(site_url, list_name, item_id, properties):
+    cache = _load_item_cache()
+    cache[f"{site_url}|{list_name}|{item_id}"] = {"expires_at": time.time() + ITEM_CACHE_TTL, "properties": properties}
+    with open(ITEM_CACHE_PATH, "w") as f:
+        json.dump(cache, f, default=str)
+    os.chmod(ITEM_CACHE_PATH, 0o600)
+
+def print_item(props):
+    print("\n--- Item Properties ---")
+    print(json.dumps(props, indent=2, default=str))
+    
+    print("\n--- FieldValuesAsText ---")
+    print(json.dumps(props.get('FieldValuesAsText', {}), indent=2, default=str))
+
+    print("\n--- Datenbank_x0020_Version Expansion ---")
+    # Check if the lookup object is present
+    db_ver = props.get('Datenbank_x0020_Version')
+    if db_ver:
+        print("Datenbank_x0020_Version object FOUND:")
+        print(json.dumps(db_ver, indent=2, default=str))
+    else:
+        print("Datenbank_x0020_Version object NOT found in properties.")
+
 def inspect_sharepoint_item(config):
     from office365.sharepoint.client_context import ClientContext
     from office365.runtime.auth.user_credential import UserCredential
@@ -34,6 +71,12 @@ def inspect_sharepoint_item(config):
     username = config.get('username')
     password = config.get('password')
     
+    cached = get_cached_item(site_url, list_name, 1)
+    if cached is not None:
+        print(f"Using cached Item ID 1 from {ITEM_CACHE_PATH}")
+        print_item(cached)
+        return
+
     print(f"Connecting to {site_url}, List: {list_name}")
     
     credentials = UserCredential(username, password)
@@ -49,7 +92,7 @@ def inspect_sharepoint_item(config):
     
     # Try 1: Standard fetch with FieldValuesAsText
     item = sp_list.get_item_by_id(1)
-    item.expand(["FieldValuesAsText", "Datenbank_x0020_Version"]) # Try expanding the lookup directly
+    item.select(ITEM_SELECT).expand(ITEM_EXPAND) # Try expanding the lookup directly
     ctx.load(item)
     try:
         ctx.execute_query()
@@ -63,25 +106,13 @@ def inspect_sharepoint_item(config):
                 print(f"Candidate Field: Title='{f.title}', Internal='{f.internal_name}', Type='{f.type_as_string}'")
         return
 
-    print("\n--- Item Properties ---")
-    props = item.properties
-    print(json.dumps(props, indent=2, default=str))
-    
-    print("\n--- FieldValuesAsText ---")
+    props = dict(item.properties)
     fv = props.get('FieldValuesAsText', {})
     if hasattr(fv, 'properties'):
-        print(json.dumps(fv.properties, indent=2))
-    else:
-        print(json.dumps(fv, indent=2))
+        props['FieldValuesAsText'] = fv.properties
 
-    print("\n--- Datenbank_x0020_Version Expansion ---")
-    # Check if the lookup object is present
-    db_ver = props.get('Datenbank_x0020_Version')
-    if db_ver:
-        print("Datenbank_x0020_Version object FOUND:")
-        print(json.dumps(db_ver, indent=2, default=str))
-    else:
-        print("Datenbank_x0020_Version object NOT found in properties.")
+    cache_item(site_url, list_name, 1, props)
+    print_item(props)
 
 if __name__ == "__main__":
     try:
@@ -1,30 +1,32 @@
-import sys
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import delete, or_, select
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from app.core.config import settings
-from app.db.models import ConfigurationItem, CIType
+from _bootstrap import SessionLocal
+from app.db.models import ConfigurationItem, CIType, Relationship
 
 def delete_databases():
-    engine = create_engine(str(settings.DATABASE_URL))
-    SessionLocal = sessionmaker(bind=engine)
     db = SessionLocal()
 
     try:
         # Filter by CI Type 'database'
-        # The Enum value is likely 'database' based on previous context
-        cis_to_delete = db.query(ConfigurationItem).filter(ConfigurationItem.ci_type == CIType.DATABASE).all()
-        
-        count = len(cis_to_delete)
-        print(f"Found {count} CIs of type 'Database'.")
+        database_ids = select(ConfigurationItem.id).where(ConfigurationItem.ci_type == CIType.DATABASE)
+
+        # Server-side deletes; relationships have no ON DELETE CASCADE in the database,
+        # so the ORM cascade is replaced by deleting their edges first
+        db.execute(
+            delete(Relationship).where(or_(
+                Relationship.source_ci_id.in_(database_ids),
+                Relationship.target_ci_id.in_(database_ids)
+            )),
+            execution_options={"synchronize_session": False}
+        )
+        result = db.execute(
+            delete(ConfigurationItem).where(ConfigurationItem.ci_type == CIType.DATABASE),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
         
-        if count > 0:
-            for ci in cis_to_delete:
-                db.delete(ci)
-            db.commit()
-            print(f"Successfully deleted {count} items.")
+        if result.rowcount > 0:
+            print(f"Successfully deleted {result.rowcount} CIs of type 'Database'.")
         else:
             print("No items to delete.")
             
@@ -1,42 +1,43 @@
-import sys
-import os
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
-
-# Add the parent directory to sys.path to import app modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import select, func, cast, String
+from sqlalchemy.orm import aliased
 
+from _bootstrap import SessionLocal
 from app.db.models import Relationship, ConfigurationItem
-from app.core.config import settings
 
 def list_relationships():
-    engine = create_engine(settings.DATABASE_URL)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = SessionLocal()
 
     try:
-        query = select(Relationship)
-        relationships = db.execute(query).scalars().all()
+        # One query for all rows; names are joined in (selecting columns only also avoids
+        # object validation errors, e.g. invalid Status Enum values)
+        source = aliased(ConfigurationItem)
+        target = aliased(ConfigurationItem)
+        query = select(
+            func.coalesce(source.name, "Unknown (" + cast(Relationship.source_ci_id, String) + ")"),
+            Relationship.relationship_type,
+            func.coalesce(target.name, "Unknown (" + cast(Relationship.target_ci_id, String) + ")")
+        ).select_from(Relationship).outerjoin(
+            source, Relationship.source_ci_id == source.id
+        ).outerjoin(
+            target, Relationship.target_ci_id == target.id
+        )
+        # Stream rows through a server-side cursor instead of buffering the whole result
+        relationships = db.execute(query.execution_options(stream_results=True, yield_per=1000))
+
+        count = 0
+        for source_name, rel_type, target_name in relationships:
+            if count == 0:
+                print("-" * 60)
+                print(f"{'Source CI':<25} | {'Type':<15} | {'Target CI':<25}")
+                print("-" * 60)
+            count += 1
+            print(f"{source_name:<25} | {rel_type.value:<15} | {target_name:<25}")
 
-        if not relationships:
+        if count == 0:
             print("No relationships found in the database.")
-            return
-
-        print(f"Found {len(relationships)} relationships:")
-        print("-" * 60)
-        print(f"{'Source CI':<25} | {'Type':<15} | {'Target CI':<25}")
-        print("-" * 60)
-
-        for rel in relationships:
-            # Fetch names directly to avoid object validation errors (e.g. invalid Status Enum)
-            source_name = db.query(ConfigurationItem.name).filter(ConfigurationItem.id == rel.source_ci_id).scalar() or f"Unknown ({rel.source_ci_id})"
-            target_name = db.query(ConfigurationItem.name).filter(ConfigurationItem.id == rel.target_ci_id).scalar() or f"Unknown ({rel.target_ci_id})"
-            
-            # handle both relation_type (model) and relationship_type (property)
-            # accessing the column attribute directly for safety
-            rel_type = rel.relationship_type
-
-            print(f"{source_name:<25} | {rel_type.value:<15} | {target_name:<25}")
+        else:
+            print("-" * 60)
+            print(f"Found {count} relationships.")
 
     except Exception as e:
         print(f"Error listing relationships: {e}")
@@ -0,0 +1,52 @@
+from sqlalchemy import text
+from _bootstrap import engine
+from app.db.models import CIType, UserRole
+
+# (table, column, enum class); native enums stored member names, the
+# VARCHAR columns store member values, hence lower().
+COLUMNS = [
+    ("users", "role", UserRole),
+    ("configuration_items", "ci_type", CIType),
+    ("cost_rules", "ci_type", CIType),
+]
+
+def migrate():
+    print("Starting migration: Replacing native enum columns with VARCHAR + CHECK...")
+
+    if engine.dialect.name != "postgresql":
+        print("Native enum types only exist on PostgreSQL. Skipping.")
+        return
+
+    with engine.connect() as connection:
+        trans = connection.begin()
+        try:
+            for table, column, enum_cls in COLUMNS:
+                udt_name = connection.execute(text(
+                    "SELECT udt_name FROM information_schema.columns WHERE table_name = :table AND column_name = :column"
+                ), {"table": table, "column": column}).scalar()
+
+                if udt_name == "varchar":
+                    print(f"Column '{table}.{column}' is already VARCHAR.")
+                    continue
+
+                print(f"Converting '{table}.{column}' ({udt_name}) to VARCHAR(32)...")
+                allowed = ", ".join(f"'{member.value}'" for member in enum_cls)
+                connection.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(32) USING lower({column}::text)"
+                ))
+                connection.execute(text(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {enum_cls.__name__.lower()} CHECK ({column} IN ({allowed}))"
+                ))
+
+            # Types are only dropped once no column references them anymore
+            connection.execute(text("DROP TYPE IF EXISTS userrole"))
+            connection.execute(text("DROP TYPE IF EXISTS citype"))
+
+            trans.commit()
+            print("Migration completed successfully.")
+        except Exception as e:
+            trans.rollback()
+            print(f"Error during migration: {e}")
+
+if __name__ == "__main__":
+    migrate()
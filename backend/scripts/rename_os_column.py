@@ -1,11 +1,6 @@
-
-import sys
 import os
 from sqlalchemy import text
 
-# Add the parent directory to sys.path to allow importing app modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Manually load .env file
 env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
 if os.path.exists(env_path):
@@ -17,52 +12,36 @@ if os.path.exists(env_path):
                 if key not in os.environ:
                     os.environ[key] = value
 
-from app.db.database import SessionLocal
+from _bootstrap import engine
+
+# Renames the column in both tables server-side in one round-trip; tables that were
+# already migrated (no 'operating_system' column) are left untouched
+RENAME_SQL = """
+DO $$
+DECLARE
+    tbl text;
+BEGIN
+    FOREACH tbl IN ARRAY ARRAY['configuration_items', 'cost_rules'] LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = tbl AND column_name = 'operating_system'
+        ) THEN
+            EXECUTE format('ALTER TABLE %I RENAME COLUMN operating_system TO os_db_system', tbl);
+            RAISE NOTICE 'Renamed in %', tbl;
+        END IF;
+    END LOOP;
+END $$;
+"""
 
 def rename_os_column():
     print("Starting migration: Renaming 'operating_system' to 'os_db_system'...")
-    db = SessionLocal()
     try:
-        # 1. Rename usage in configuration_items
-        check_query = text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name='configuration_items' AND column_name='operating_system';
-        """)
-        result = db.execute(check_query).fetchone()
-        
-        if result:
-            print("Found 'operating_system' in 'configuration_items'. Renaming...")
-            alter_query = text("ALTER TABLE configuration_items RENAME COLUMN operating_system TO os_db_system;")
-            db.execute(alter_query)
-            print("Renamed in 'configuration_items'.")
-        else:
-            print("'operating_system' not found in 'configuration_items' (maybe already renamed?).")
-
-        # 2. Rename usage in cost_rules
-        check_query_cost = text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name='cost_rules' AND column_name='operating_system';
-        """)
-        result_cost = db.execute(check_query_cost).fetchone()
-
-        if result_cost:
-             print("Found 'operating_system' in 'cost_rules'. Renaming...")
-             alter_query_cost = text("ALTER TABLE cost_rules RENAME COLUMN operating_system TO os_db_system;")
-             db.execute(alter_query_cost)
-             print("Renamed in 'cost_rules'.")
-        else:
-            print("'operating_system' not found in 'cost_rules'.")
-
-        db.commit()
+        with engine.begin() as connection:
+            connection.execute(text(RENAME_SQL))
         print("Migration completed successfully.")
             
     except Exception as e:
         print(f"Error during migration: {e}")
-        db.rollback()
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     rename_os_column()
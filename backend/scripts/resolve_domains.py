@@ -1,70 +1,95 @@
-import sys
 import os
 import socket
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
-# Add the parent directory to sys.path to allow importing app modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Load .env file
 env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
 load_dotenv(env_path)
 
-from app.db.database import SessionLocal
+from _bootstrap import SessionLocal
 from app.db.models import ConfigurationItem, Domain
 
+# DNS lookups are network-bound; resolve this many names at once
+DNS_WORKERS = 64
+# Seconds before a single lookup is given up on
+DNS_TIMEOUT = 2.0
+
+def resolve_ip(fqdn):
+    """Return the first IPv4/IPv6 address for fqdn, or None if it does not resolve."""
+    try:
+        # SOCK_STREAM: one entry per address instead of one per socket type
+        infos = socket.getaddrinfo(fqdn, None, type=socket.SOCK_STREAM)
+    except (socket.gaierror, socket.timeout):
+        return None
+    return infos[0][4][0] if infos else None
+
 def resolve_dns_for_cis():
     db: Session = SessionLocal()
     try:
         # Get active domains (suffixes)
-        domains = db.query(Domain).filter(Domain.is_active == True).all()
-        if not domains:
+        domain_names = db.execute(select(Domain.name).where(Domain.is_active == True)).scalars().all()
+        if not domain_names:
             print("No active domains found to test against.")
             return
 
-        print(f"Loaded {len(domains)} active domains: {[d.name for d in domains]}")
+        print(f"Loaded {len(domain_names)} active domains: {domain_names}")
 
-        # Get all CIs
-        cis = db.query(ConfigurationItem).all()
+        # Get all CIs (only the columns used here, no ORM objects)
+        cis = db.execute(select(ConfigurationItem.id, ConfigurationItem.name, ConfigurationItem.domain)).all()
         
         print(f"Processing {len(cis)} CIs...")
 
-        for ci in cis:
+        # Results are memoized per FQDN for the run, so misses are never looked up twice
+        ips = {}
+        def resolve_many(executor, fqdns):
+            pending = list({fqdn for fqdn in fqdns if fqdn not in ips})
+            ips.update(zip(pending, executor.map(resolve_ip, pending)))
+
+        updates = []
+        with ThreadPoolExecutor(max_workers=DNS_WORKERS) as executor:
+            # CIs whose current domain still resolves need no further lookups
+            resolve_many(executor, [f"{ci.name}.{ci.domain}" for ci in cis if ci.domain])
+            unresolved = [ci for ci in cis if not (ci.domain and ips[f"{ci.name}.{ci.domain}"])]
+            print(f"{len(cis) - len(unresolved)} CIs still resolve with their current domain.")
+
+            # Resolve every remaining CI/domain combination concurrently up front
+            resolve_many(executor, [f"{ci.name}.{domain}" for ci in unresolved for domain in domain_names])
+
+        for ci in unresolved:
             print(f"Checking CI: {ci.name} (Current Domain: {ci.domain})")
             
             resolved_domain = None
             
-            # Try each domain suffix
-            for domain in domains:
-                fqdn = f"{ci.name}.{domain.name}"
-                try:
-                    # Try to resolve
-                    ip_address = socket.gethostbyname(fqdn)
-                    print(f"  [SUCCESS] Resolved {fqdn} -> {ip_address}")
-                    resolved_domain = domain.name
-                    break # Stop after first success
-                except socket.gaierror:
-                    # Resolution failed
-                    # print(f"  [FAILED]  Could not resolve {fqdn}")
-                    pass
+            # First domain suffix (in domain order) that resolved wins
+            for domain in domain_names:
+                fqdn = f"{ci.name}.{domain}"
+                if ips[fqdn]:
+                    print(f"  [SUCCESS] Resolved {fqdn} -> {ips[fqdn]}")
+                    resolved_domain = domain
+                    break
             
             if resolved_domain:
-                if ci.domain != resolved_domain:
-                    print(f"  -> Updating CI {ci.name} domain to {resolved_domain}")
-                    ci.domain = resolved_domain
-                    db.commit()
-                else:
-                    print(f"  -> CI {ci.name} already has correct domain set.")
+                print(f"  -> Updating CI {ci.name} domain to {resolved_domain}")
+                updates.append({"id": ci.id, "domain": resolved_domain})
             else:
                 print(f"  -> Could not resolve CI {ci.name} with any known domain.")
 
+        # All domain changes in one executemany UPDATE and a single commit
+        if updates:
+            db.execute(update(ConfigurationItem), updates)
+            db.commit()
+        print(f"Updated {len(updates)} CIs.")
+
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
         db.close()
 
 if __name__ == "__main__":
+    socket.setdefaulttimeout(DNS_TIMEOUT)
     print("Starting DNS resolution check...")
     resolve_dns_for_cis()
     print("Done.")
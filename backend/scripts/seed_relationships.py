@@ -1,19 +1,11 @@
-import sys
-import os
 import random
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-# Add the parent directory to sys.path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import select
 
+from _bootstrap import SessionLocal
 from app.db.models import Relationship, ConfigurationItem, RelationType
-from app.core.config import settings
 
 def seed_relationships():
     print("Connecting to database...")
-    engine = create_engine(settings.DATABASE_URL)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = SessionLocal()
 
     try:
@@ -28,8 +20,10 @@ def seed_relationships():
 
         print(f"Found {len(ci_ids)} CIs. Creating random relationships...")
         
-        created_count = 0
         relation_types = list(RelationType)
+        # Existing (source, target) pairs, loaded once for O(1) membership checks
+        existing = set(db.execute(select(Relationship.source_ci_id, Relationship.target_ci_id)).all())
+        new_relationships = []
 
         for _ in range(20):
             source_id = random.choice(ci_ids)
@@ -39,26 +33,21 @@ def seed_relationships():
             if source_id == target_id:
                 continue
                 
-            # Check if relationship already exists
-            exists = db.query(Relationship).filter(
-                Relationship.source_ci_id == source_id,
-                Relationship.target_ci_id == target_id
-            ).first()
-            
-            if not exists:
+            # Check if relationship already exists (including ones created in this run)
+            if (source_id, target_id) not in existing:
+                existing.add((source_id, target_id))
                 rel_type = random.choice(relation_types)
-                new_rel = Relationship(
+                new_relationships.append(Relationship(
                     source_ci_id=source_id,
                     target_ci_id=target_id,
                     relationship_type=rel_type,
                     description=f"Auto-generated dependency: {source_id} -> {target_id}"
-                )
-                db.add(new_rel)
-                created_count += 1
+                ))
                 print(f"Created relationship: {source_id} --[{rel_type.value}]--> {target_id}")
 
+        db.add_all(new_relationships)
         db.commit()
-        print(f"Successfully created {created_count} new relationships.")
+        print(f"Successfully created {len(new_relationships)} new relationships.")
 
     except Exception as e:
         print(f"Error seeding relationships: {e}")
@@ -1,19 +1,9 @@
-
-import sys
-import os
-import json
 from datetime import datetime
-
-# Add the parent directory to the path so we can import the app
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Set dummy SECRET_KEY for script execution if not present
-if not os.environ.get("SECRET_KEY"):
-    os.environ["SECRET_KEY"] = "script-dummy-key-super-secret"
-
+from sqlalchemy import select, insert
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal, engine
+from _bootstrap import SessionLocal
 from app.db.models import SoftwareCatalog, SoftwareCategory, SoftwareStatus
+from app.services.software_service import upsert_software_aliases
 
 def get_db():
     db = SessionLocal()
@@ -180,32 +170,37 @@ def seed_data():
     db = next(get_db())
     print("Starting software catalog seeding...")
     
-    count_new = 0
-    count_existing = 0
+    # software_catalog.name is not unique, so ON CONFLICT has nothing to match:
+    # look up the names already present and insert only the missing entries
+    seed_names = [item["name"] for item in SOFTWARE_DATA]
+    existing = set(db.execute(
+        select(SoftwareCatalog.name).where(SoftwareCatalog.name.in_(seed_names))
+    ).scalars())
+    missing = [item for item in SOFTWARE_DATA if item["name"] not in existing]
+
+    # One INSERT for all missing entries
+    created = []
+    if missing:
+        stmt = insert(SoftwareCatalog).values([
+            {
+                "name": item["name"],
+                "version": item["version"],
+                "publisher": item["publisher"],
+                "category": item["category"],
+                "status": item["status"],
+                "end_of_life_date": item["end_of_life_date"],
+                "aliases": item["aliases"]
+            }
+            for item in missing
+        ]).returning(SoftwareCatalog.id, SoftwareCatalog.name, SoftwareCatalog.aliases)
+        created = db.execute(stmt).all()
 
-    for item in SOFTWARE_DATA:
-        # Check if exists by name
-        existing = db.query(SoftwareCatalog).filter(SoftwareCatalog.name == item["name"]).first()
-        
-        if existing:
-            print(f"Skipping {item['name']} (already exists)")
-            count_existing += 1
-        else:
-            print(f"Creating {item['name']}...")
-            new_software = SoftwareCatalog(
-                name=item["name"],
-                version=item["version"],
-                publisher=item["publisher"],
-                category=item["category"],
-                status=item["status"],
-                end_of_life_date=item["end_of_life_date"],
-                aliases=json.dumps(item["aliases"])
-            )
-            db.add(new_software)
-            count_new += 1
+    for row in created:
+        print(f"Created {row.name}")
+    upsert_software_aliases(db, {row.id: row.aliases for row in created})
     
     db.commit()
-    print(f"Seeding completed. New: {count_new}, Existing: {count_existing}")
+    print(f"Seeding completed. New: {len(created)}, Existing: {len(SOFTWARE_DATA) - len(created)}")
 
 if __name__ == "__main__":
     seed_data()
@@ -1,14 +1,4 @@
-
-import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Set dummy SECRET_KEY if needed
-if not os.environ.get("SECRET_KEY"):
-    os.environ["SECRET_KEY"] = "script-dummy-key-super-secret"
-
-from app.db.database import SessionLocal
+from _bootstrap import SessionLocal
 from app.db.models import SoftwareCatalog
 
 def verify():
@@ -1,13 +1,9 @@
-import sys
 import os
 import json
 import logging
 from datetime import datetime
 
-# Add backend to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-from app.db.database import SessionLocal
+from _bootstrap import SessionLocal
 from app.core.import_engine import ReconciliationService
 from app.db.models import ImportSource, ImportLog
 
@@ -24,7 +20,7 @@ def verify_logging():
             source = ImportSource(
                 name="Test Log Source",
                 source_type="csv",
-                config=json.dumps({
+                config={
                     "file_path": "test_import.csv",
                     "field_mapping": {
                         "name": "Name",
@@ -34,7 +30,7 @@ def verify_logging():
                         "key_field": "name",
                         "update_mode": "upsert"
                     }
-                })
+                }
             )
             db.add(source)
             db.commit()
@@ -44,10 +40,8 @@ def verify_logging():
         csv_path = os.path.join(os.path.dirname(__file__), '..', 'test_import.csv')
         csv_path = os.path.abspath(csv_path)
         
-        # Update config with absolute path
-        config = json.loads(source.config)
-        config['file_path'] = csv_path
-        source.config = json.dumps(config)
+        # Update config with absolute path (JSONB: assign a new dict so the change is flushed)
+        source.config = {**source.config, 'file_path': csv_path}
         db.commit()
         
         with open(csv_path, 'w') as f:
@@ -72,7 +66,7 @@ def verify_logging():
             logger.error("Details field is empty!")
             return
             
-        details = json.loads(log_entry.details)
+        details = log_entry.details
         log_file = details.get('log_file')
         
         if not log_file:
@@ -83,12 +77,13 @@ def verify_logging():
             logger.error(f"Log file does not exist at: {log_file}")
             return
             
-        # 5. Check Log File Content
+        # 5. Check Log File Content (NDJSON: only the first record is needed)
         with open(log_file, 'r') as f:
-            audit_data = json.load(f)
-            logger.info(f"Audit Log Content: {json.dumps(audit_data, indent=2)}")
+            first_line = f.readline()
+        first_entry = json.loads(first_line) if first_line.strip() else None
+        logger.info(f"First Audit Log Entry: {json.dumps(first_entry, indent=2)}")
             
-        if len(audit_data) > 0 and audit_data[0]['action'] == 'created':
+        if first_entry and first_entry['action'] == 'created':
             logger.info("SUCCESS: Audit log contains created item.")
         else:
             logger.error("FAILURE: Audit log missing or incorrect.")
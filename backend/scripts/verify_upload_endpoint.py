@@ -1,6 +1,8 @@
 import sys
 import os
 import shutil
+import tempfile
+from pathlib import Path
 from fastapi.testclient import TestClient
 
 # Add backend to path
@@ -11,8 +13,11 @@ from app.main import app
 def verify_upload():
     client = TestClient(app)
     
-    # Create a dummy CSV content
-    file_content = b"name,status\nTestUpload,Active"
+    # Dummy CSV fixture on disk; the client streams it from the file handle
+    fixture = tempfile.NamedTemporaryFile(suffix=".csv")
+    fixture.write(b"name,status\nTestUpload,Active")
+    fixture.flush()
+    fixture.seek(0)
     
     # Mock authentication override if needed, but for now let's try 
     # The endpoint requires Admin role. 
@@ -29,10 +34,11 @@ def verify_upload():
     app.dependency_overrides[get_current_user] = lambda: mock_admin
     
     print("Testing upload endpoint...")
-    response = client.post(
-        "/api/import/upload-source-file",
-        files={"file": ("test_upload.csv", file_content, "text/csv")}
-    )
+    with fixture:
+        response = client.post(
+            "/api/import/upload-source-file",
+            files={"file": ("test_upload.csv", fixture, "text/csv")}
+        )
     
     print(f"Status Code: {response.status_code}")
     if response.status_code == 201:
@@ -40,10 +46,10 @@ def verify_upload():
         print(f"Response: {data}")
         
         file_path = data.get("file_path")
-        if file_path and os.path.exists(file_path):
+        if file_path and Path(file_path).is_file():
             print("SUCCESS: File uploaded and exists on disk.")
             # Cleanup
-            os.remove(file_path)
+            Path(file_path).unlink(missing_ok=True)
             print("Cleanup: Deleted test file.")
         else:
             print("FAILURE: File path returned but file not found.")
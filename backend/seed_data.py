@@ -1,160 +1,226 @@
 import sys
+import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+import orjson
+from sqlalchemy import select, insert, exists, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.db.database import SessionLocal
-from app.db.models import User, ConfigurationItem, Relationship, UserRole, CIType, CIStatus, RelationType
+from app.db.models import User, ConfigurationItem, UserRole, CIType, CIStatus, RelationType
 from app.core.auth import get_password_hash
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows whose presence means a previous run already seeded the database
+SENTINEL_USERNAME = "admin"
+SENTINEL_CI_NAME = "app-ecommerce-web"
+
+# Local cache of seed password hashes (gitignored); bcrypt only runs for unseen passwords
+HASH_CACHE_FILE = Path(__file__).resolve().parent / ".seed_hash_cache.json"
+
+# Seed definitions: built once at import, read-only
+SEED_USERS = (
+    MappingProxyType({
+        "email": "admin@example.com",
+        "username": "admin",
+        "password": "adminpassword",
+        "full_name": "Admin User",
+        "role": UserRole.ADMIN
+    }),
+    MappingProxyType({
+        "email": "user@example.com",
+        "username": "user",
+        "password": "userpassword",
+        "full_name": "Regular User",
+        "role": UserRole.VIEWER
+    })
+)
+
+SEED_CIS = (
+    MappingProxyType({
+        "name": "srv-prod-01",
+        "ci_type": CIType.SERVER,
+        "status": CIStatus.ACTIVE,
+        "description": "Primary production server",
+        "environment": "Production",
+        "os_db_system": "Ubuntu 22.04 LTS"
+    }),
+    MappingProxyType({
+        "name": "db-prod-primary",
+        "ci_type": CIType.DATABASE,
+        "status": CIStatus.ACTIVE,
+        "description": "Primary PostgreSQL database",
+        "environment": "Production",
+        "technical_details": {"version": "15", "port": 5432}
+    }),
+    MappingProxyType({
+        "name": "app-ecommerce-web",
+        "ci_type": CIType.APPLICATION,
+        "status": CIStatus.ACTIVE,
+        "description": "E-commerce Web Frontend",
+        "environment": "Production",
+        "department": "Web Team"
+    }),
+    MappingProxyType({
+        "name": "net-switch-core",
+        "ci_type": CIType.NETWORK_DEVICE,
+        "status": CIStatus.ACTIVE,
+        "description": "Core Switch",
+        "location": "Data Center A, Rack 1"
+    }),
+    MappingProxyType({
+        "name": "srv-test-01",
+        "ci_type": CIType.SERVER,
+        "status": CIStatus.MAINTENANCE,
+        "description": "Test server",
+        "environment": "Test",
+        "os_db_system": "Windows Server 2022"
+    })
+)
+
+SEED_RELATIONSHIPS = (
+    MappingProxyType({
+        "source": "app-ecommerce-web",
+        "target": "srv-prod-01",
+        "type": RelationType.RUNS_ON
+    }),
+    MappingProxyType({
+        "source": "app-ecommerce-web",
+        "target": "db-prod-primary",
+        "type": RelationType.CONNECTS_TO
+    }),
+    MappingProxyType({
+        "source": "srv-prod-01",
+        "target": "net-switch-core",
+        "type": RelationType.CONNECTS_TO
+    })
+)
+
+# Inserts the seed edges with CI ids looked up by name in the database; existing
+# edges are skipped (uq_relationship_edge). Returns the names of the edges created.
+INSERT_RELATIONSHIPS_SQL = text("""
+    WITH v(src, tgt, rtype) AS (
+        SELECT * FROM unnest(CAST(:sources AS text[]), CAST(:targets AS text[]), CAST(:types AS text[]))
+    ),
+    edges AS (
+        SELECT s.id AS source_id, t.id AS target_id, CAST(v.rtype AS relationtype) AS rtype, v.src, v.tgt
+        FROM v
+        JOIN configuration_items s ON s.name = v.src AND s.deleted_at IS NULL
+        JOIN configuration_items t ON t.name = v.tgt AND t.deleted_at IS NULL
+    ),
+    inserted AS (
+        INSERT INTO relationships (source_ci_id, target_ci_id, relationship_type)
+        SELECT source_id, target_id, rtype FROM edges
+        ON CONFLICT ON CONSTRAINT uq_relationship_edge DO NOTHING
+        RETURNING source_ci_id, target_ci_id, relationship_type
+    )
+    SELECT e.src, e.tgt, CAST(e.rtype AS text)
+    FROM inserted i
+    JOIN edges e ON e.source_id = i.source_ci_id AND e.target_id = i.target_ci_id AND e.rtype = i.relationship_type
+""")
+
+
+def _hash_cache_key(username, password):
+    return hashlib.sha256(f"{username}\0{password}".encode()).hexdigest()
+
+def hash_seed_passwords(users):
+    """Return bcrypt hashes for the users' passwords, reusing hashes cached by earlier runs."""
+    try:
+        cache = orjson.loads(HASH_CACHE_FILE.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        cache = {}
+
+    keys = [_hash_cache_key(u["username"], u["password"]) for u in users]
+    missing = [(key, u["password"]) for key, u in zip(keys, users) if key not in cache]
+    if missing:
+        # bcrypt is CPU-bound: hash all passwords in parallel, one per core
+        with ProcessPoolExecutor() as executor:
+            hashes = executor.map(get_password_hash, [password for _, password in missing])
+            cache.update(zip((key for key, _ in missing), hashes))
+        HASH_CACHE_FILE.write_bytes(orjson.dumps(cache))
+    return [cache[key] for key in keys]
+
+
 def seed_data():
     db = SessionLocal()
     try:
+        # Both sentinels checked in one round-trip; a seeded database is left as is
+        user_seeded, ci_seeded = db.execute(select(
+            exists().where(User.username == SENTINEL_USERNAME),
+            exists().where(ConfigurationItem.name == SENTINEL_CI_NAME, ConfigurationItem.deleted_at.is_(None))
+        )).one()
+        if user_seeded and ci_seeded:
+            logger.info("Already seeded; skipping.")
+            return
+
         # 1. Create Users
         logger.info("Seeding users...")
-        users = [
-            {
-                "email": "admin@example.com",
-                "username": "admin",
-                "password": "adminpassword",
-                "full_name": "Admin User",
-                "role": UserRole.ADMIN
-            },
-            {
-                "email": "user@example.com",
-                "username": "user",
-                "password": "userpassword",
-                "full_name": "Regular User",
-                "role": UserRole.VIEWER
-            }
-        ]
-
-        for user_data in users:
-            existing_user = db.query(User).filter(User.username == user_data["username"]).first()
-            if not existing_user:
-                new_user = User(
-                    email=user_data["email"],
-                    username=user_data["username"],
-                    hashed_password=get_password_hash(user_data["password"]),
-                    full_name=user_data["full_name"],
-                    role=user_data["role"]
-                )
-                db.add(new_user)
-                logger.info(f"Created user: {user_data['username']}")
+        hashes = hash_seed_passwords(SEED_USERS)
+
+        # The database skips usernames that already exist; RETURNING reports the new ones
+        created_users = set(db.execute(
+            pg_insert(User).values([
+                {
+                    "email": u["email"],
+                    "username": u["username"],
+                    "hashed_password": hashed,
+                    "full_name": u["full_name"],
+                    "role": u["role"]
+                }
+                for u, hashed in zip(SEED_USERS, hashes)
+            ]).on_conflict_do_nothing(index_elements=[User.username]).returning(User.username)
+        ).scalars())
+        for user_data in SEED_USERS:
+            if user_data["username"] in created_users:
+                logger.info("Created user: %s", user_data["username"])
             else:
-                logger.info(f"User {user_data['username']} already exists.")
-        
-        db.commit()
+                logger.info("User %s already exists.", user_data["username"])
 
         # 2. Create CIs
         logger.info("Seeding Configuration Items...")
-        cis = [
-            {
-                "name": "srv-prod-01",
-                "ci_type": CIType.SERVER,
-                "status": CIStatus.ACTIVE,
-                "description": "Primary production server",
-                "environment": "Production",
-                "os_db_system": "Ubuntu 22.04 LTS"
-            },
-            {
-                "name": "db-prod-primary",
-                "ci_type": CIType.DATABASE,
-                "status": CIStatus.ACTIVE,
-                "description": "Primary PostgreSQL database",
-                "environment": "Production",
-                "technical_details": '{"version": "15", "port": 5432}'
-            },
-            {
-                "name": "app-ecommerce-web",
-                "ci_type": CIType.APPLICATION,
-                "status": CIStatus.ACTIVE,
-                "description": "E-commerce Web Frontend",
-                "environment": "Production",
-                "department": "Web Team"
-            },
-            {
-                "name": "net-switch-core",
-                "ci_type": CIType.NETWORK_DEVICE,
-                "status": CIStatus.ACTIVE,
-                "description": "Core Switch",
-                "location": "Data Center A, Rack 1"
-            },
-            {
-                "name": "srv-test-01",
-                "ci_type": CIType.SERVER,
-                "status": CIStatus.MAINTENANCE,
-                "description": "Test server",
-                "environment": "Test",
-                "os_db_system": "Windows Server 2022"
-            }
-        ]
-
-        created_cis = {}
-        for ci_data in cis:
-            existing_ci = db.query(ConfigurationItem).filter(ConfigurationItem.name == ci_data["name"]).first()
-            if not existing_ci:
-                new_ci = ConfigurationItem(**ci_data)
-                db.add(new_ci)
-                # Flush to get the ID for relationships
-                db.flush()
-                created_cis[ci_data["name"]] = new_ci
-                logger.info(f"Created CI: {ci_data['name']}")
+        # One lookup for the live seed CIs that already exist, one INSERT for the rest.
+        # Passed as executemany parameters since the CIs don't all set the same columns
+        existing_cis = set(db.execute(
+            select(ConfigurationItem.name, ConfigurationItem.ci_type).where(
+                ConfigurationItem.name.in_([c["name"] for c in SEED_CIS]),
+                ConfigurationItem.deleted_at.is_(None)
+            )
+        ).all())
+        new_cis = [dict(c) for c in SEED_CIS if (c["name"], c["ci_type"]) not in existing_cis]
+        if new_cis:
+            db.execute(insert(ConfigurationItem), new_cis)
+        created_cis = {c["name"] for c in new_cis}
+        for ci_data in SEED_CIS:
+            if ci_data["name"] in created_cis:
+                logger.info("Created CI: %s", ci_data["name"])
             else:
-                created_cis[ci_data["name"]] = existing_ci
-                logger.info(f"CI {ci_data['name']} already exists.")
-        
-        db.commit()
+                logger.info("CI %s already exists.", ci_data["name"])
 
         # 3. Create Relationships
         logger.info("Seeding Relationships...")
-        relationships = [
-            {
-                "source": "app-ecommerce-web",
-                "target": "srv-prod-01",
-                "type": RelationType.RUNS_ON
-            },
-            {
-                "source": "app-ecommerce-web",
-                "target": "db-prod-primary",
-                "type": RelationType.CONNECTS_TO
-            },
-            {
-                "source": "srv-prod-01",
-                "target": "net-switch-core",
-                "type": RelationType.CONNECTS_TO
-            }
-        ]
-
-        for rel in relationships:
-            source_ci = created_cis.get(rel["source"])
-            target_ci = created_cis.get(rel["target"])
-            
-            if source_ci and target_ci:
-                # Check if relationship exists (simplified check)
-                existing_rel = db.query(Relationship).filter(
-                    Relationship.source_ci_id == source_ci.id,
-                    Relationship.target_ci_id == target_ci.id,
-                    Relationship.relationship_type == rel["type"]
-                ).first()
-                
-                if not existing_rel:
-                    new_rel = Relationship(
-                        source_ci_id=source_ci.id,
-                        target_ci_id=target_ci.id,
-                        relationship_type=rel["type"]
-                    )
-                    db.add(new_rel)
-                    logger.info(f"Created relationship: {rel['source']} -> {rel['type']} -> {rel['target']}")
-                else:
-                    logger.info(f"Relationship {rel['source']} -> {rel['target']} already exists.")
+        # Native enum column: the database stores member names
+        created_rels = set(db.execute(INSERT_RELATIONSHIPS_SQL, {
+            "sources": [rel["source"] for rel in SEED_RELATIONSHIPS],
+            "targets": [rel["target"] for rel in SEED_RELATIONSHIPS],
+            "types": [rel["type"].name for rel in SEED_RELATIONSHIPS]
+        }).all())
+
+        for rel in SEED_RELATIONSHIPS:
+            if (rel["source"], rel["target"], rel["type"].name) in created_rels:
+                logger.info("Created relationship: %s -> %s -> %s", rel["source"], rel["type"], rel["target"])
+            else:
+                logger.info("Relationship %s -> %s already exists.", rel["source"], rel["target"])
 
+        # Single commit for all three phases: a failed seed leaves nothing behind
         db.commit()
         logger.info("Data seeding completed successfully.")
 
     except Exception as e:
-        logger.error(f"Error seeding data: {e}")
+        logger.error("Error seeding data: %s", e)
         db.rollback()
         sys.exit(1)
     finally:
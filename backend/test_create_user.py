@@ -1,4 +1,9 @@
 import requests
+from requests.adapters import HTTPAdapter
+
+# One keep-alive connection pool for every call in this script
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
 
 # Constants
 API_URL = "http://localhost:8000/api"
@@ -7,7 +12,7 @@ ADMIN_PASSWORD = "adminpassword"
 
 def get_admin_token():
     try:
-        response = requests.post(f"{API_URL}/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+        response = _session.post(f"{API_URL}/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
         response.raise_for_status()
         return response.json()["access_token"]
     except Exception as e:
@@ -19,7 +24,7 @@ def test_create_user():
     if not token:
         return
     
-    headers = {"Authorization": f"Bearer {token}"}
+    _session.headers.update({"Authorization": f"Bearer {token}"})
     
     print("\n1. Attempting to create user 'testuser'...")
     user_data = {
@@ -29,7 +34,7 @@ def test_create_user():
         "password": "testpassword123"
     }
     
-    res = requests.post(f"{API_URL}/auth/register", json=user_data, headers=headers)
+    res = _session.post(f"{API_URL}/auth/register", json=user_data)
     
     print(f"Status code: {res.status_code}")
     print(f"Response: {res.text}")
@@ -43,7 +48,7 @@ def test_create_user():
         
         # Try to login
         print("\n2. Testing login with new user...")
-        login_res = requests.post(
+        login_res = _session.post(
             f"{API_URL}/auth/login",
             data={"username": "testuser", "password": "testpassword123"}
         )
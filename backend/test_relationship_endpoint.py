@@ -1,5 +1,10 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+# One keep-alive connection pool for every call in this script
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
 
 # Login to get token
 login_url = "http://localhost:8000/api/auth/login"
@@ -8,7 +13,7 @@ headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
 try:
     print("Logging in...")
-    response = requests.post(login_url, data=data, headers=headers)
+    response = _session.post(login_url, data=data, headers=headers)
     response.raise_for_status()
     token = response.json()["access_token"]
     print("Login successful.")
@@ -16,9 +21,9 @@ try:
     # Fetch relationships
     print("Fetching relationships...")
     api_url = "http://localhost:8000/api/relationships"
-    auth_header = {"Authorization": f"Bearer {token}"}
+    _session.headers.update({"Authorization": f"Bearer {token}"})
     
-    resp = requests.get(api_url, headers=auth_header)
+    resp = _session.get(api_url)
     resp.raise_for_status()
     
     data = resp.json()
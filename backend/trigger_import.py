@@ -1,52 +1,77 @@
+import time
 import requests
+from requests.adapters import HTTPAdapter
+
+# One keep-alive connection pool for every call in this script
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
 
 # Constants
 API_URL = "http://localhost:8000/api"
 ADMIN_USERNAME = "admin"
 ADMIN_PASSWORD = "adminpassword"
+# Import log statuses after which the job is done
+TERMINAL_STATUSES = ("success", "partial_success", "failed")
+POLL_TIMEOUT = 60  # seconds
 
 def get_admin_token():
     try:
-        response = requests.post(f"{API_URL}/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+        response = _session.post(f"{API_URL}/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
         response.raise_for_status()
         return response.json()["access_token"]
     except Exception as e:
         print(f"Failed to login as admin: {e}")
         return None
 
+def get_latest_log():
+    res = _session.get(f"{API_URL}/import/history?limit=1")
+    logs = res.json() if res.status_code == 200 else []
+    return logs[0] if logs else None
+
+def wait_for_import(previous_id):
+    """Poll the history with exponential backoff (0.1s doubling up to 1s) until the new import finishes."""
+    deadline = time.monotonic() + POLL_TIMEOUT
+    delay = 0.1
+    log = None
+    while time.monotonic() < deadline:
+        log = get_latest_log()
+        # Only a log newer than the one seen before triggering belongs to this run
+        if log and log['id'] != previous_id and log['status'] in TERMINAL_STATUSES:
+            return log
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+    return log
+
 def trigger_import():
     token = get_admin_token()
     if not token:
         return
     
-    headers = {"Authorization": f"Bearer {token}"}
+    _session.headers.update({"Authorization": f"Bearer {token}"})
     
+    previous = get_latest_log()
+    previous_id = previous['id'] if previous else None
+
     # Trigger import for source ID 5 (SP CSV)
     print("Triggering import for source ID 5 (SP CSV)...")
-    res = requests.post(f"{API_URL}/import/sources/5/run", headers=headers)
+    res = _session.post(f"{API_URL}/import/sources/5/run")
     
     print(f"Status: {res.status_code}")
     print(f"Response: {res.text}")
     
     if res.status_code == 202:
         print("\n✓ Import job scheduled successfully")
-        print("Waiting 5 seconds for import to complete...")
-        import time
-        time.sleep(5)
+        print(f"Waiting up to {POLL_TIMEOUT} seconds for import to complete...")
+        log = wait_for_import(previous_id)
         
-        # Check import history
-        hist_res = requests.get(f"{API_URL}/import/history?limit=1", headers=headers)
-        if hist_res.status_code == 200:
-            logs = hist_res.json()
-            if logs:
-                log = logs[0]
-                print(f"\nLatest import:")
-                print(f"  Status: {log['status']}")
-                print(f"  Processed: {log['records_processed']}")
-                print(f"  Success: {log['records_success']}")
-                print(f"  Failed: {log['records_failed']}")
-                if log.get('error_message'):
-                    print(f"  Error: {log['error_message']}")
+        if log:
+            print(f"\nLatest import:")
+            print(f"  Status: {log['status']}")
+            print(f"  Processed: {log['records_processed']}")
+            print(f"  Success: {log['records_success']}")
+            print(f"  Failed: {log['records_failed']}")
+            if log.get('error_message'):
+                print(f"  Error: {log['error_message']}")
 
 if __name__ == "__main__":
     trigger_import()
@@ -10,6 +10,12 @@ sys.path.append(os.getcwd())
 
 from app.core.import_engine import OracleConnector
 
+def mock_connection(mock_oracledb):
+    """Make oracledb.connect() return a fresh mock connection and return it."""
+    mock_conn = MagicMock()
+    mock_oracledb.connect.return_value.__enter__.return_value = mock_conn
+    return mock_conn
+
 def verify_oracle_connector():
     print("Verifying OracleConnector...")
     
@@ -23,12 +29,12 @@ def verify_oracle_connector():
     
     connector = OracleConnector(config)
     
-    # Test 1: Test Connection
-    print("\nTest 1: Testing Connection Logic")
+    # One patch for both tests; the mock is reset in between
     with patch("app.core.import_engine.oracledb") as mock_oracledb:
+        # Test 1: Test Connection
+        print("\nTest 1: Testing Connection Logic")
         # Mock successful connection
-        mock_conn = MagicMock()
-        mock_oracledb.connect.return_value.__enter__.return_value = mock_conn
+        mock_connection(mock_oracledb)
         
         result = connector.test_connection()
         
@@ -45,14 +51,14 @@ def verify_oracle_connector():
         )
         print("SUCCESS: oracledb.connect called with correct parameters")
 
-    # Test 2: Fetch Data
-    print("\nTest 2: Testing Fetch Data Logic")
-    with patch("app.core.import_engine.oracledb") as mock_oracledb:
-        mock_conn = MagicMock()
+        mock_oracledb.reset_mock()
+
+        # Test 2: Fetch Data
+        print("\nTest 2: Testing Fetch Data Logic")
+        mock_conn = mock_connection(mock_oracledb)
         mock_cursor = MagicMock()
         
         # Setup mock return values
-        mock_oracledb.connect.return_value.__enter__.return_value = mock_conn
         mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
         
         # Mock description for columns
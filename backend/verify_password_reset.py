@@ -1,4 +1,9 @@
 import requests
+from requests.adapters import HTTPAdapter
+
+# One keep-alive connection pool for every call in this script
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
 
 # Constants
 API_URL = "http://localhost:8000/api"
@@ -7,7 +12,7 @@ PASSWORD = "adminpassword"
 
 def get_token():
     try:
-        response = requests.post(f"{API_URL}/auth/login", data={"username": USERNAME, "password": PASSWORD})
+        response = _session.post(f"{API_URL}/auth/login", data={"username": USERNAME, "password": PASSWORD})
         response.raise_for_status()
         return response.json()["access_token"]
     except Exception as e:
@@ -20,10 +25,10 @@ def verify_password_reset():
         print("Skipping verification due to login failure.")
         return
 
-    headers = {"Authorization": f"Bearer {token}"}
+    _session.headers.update({"Authorization": f"Bearer {token}"})
     
     # Get users
-    res = requests.get(f"{API_URL}/users", headers=headers)
+    res = _session.get(f"{API_URL}/users")
     users = res.json()
     
     # Find a non-admin user
@@ -35,10 +40,9 @@ def verify_password_reset():
     
     print(f"\n1. Resetting password for user '{test_user['username']}'")
     new_pass = "newpassword123"
-    res_reset = requests.post(
+    res_reset = _session.post(
         f"{API_URL}/users/{test_user['id']}/reset-password",
-        params={"new_password": new_pass},
-        headers=headers
+        params={"new_password": new_pass}
     )
     
     if res_reset.status_code == 200:
@@ -46,7 +50,7 @@ def verify_password_reset():
         
         # Try logging in with new password
         print(f"\n2. Testing login with new password")
-        login_res = requests.post(
+        login_res = _session.post(
             f"{API_URL}/auth/login",
             data={"username": test_user['username'], "password": new_pass}
         )
@@ -1,6 +1,5 @@
 import sys
 import os
-import json
 import logging
 
 # Add backend to path
@@ -29,12 +28,11 @@ def test_oracle_connection():
 
         for source in sources:
             print(f"Testing Source: {source.name} (ID: {source.id})")
-            config = json.loads(source.config)
+            # JSONB column: already a dict, nothing to parse
+            config = source.config or {}
             
             # Mask password for display
-            safe_config = config.copy()
-            if 'password' in safe_config:
-                safe_config['password'] = '******'
+            safe_config = {**config, 'password': '******'} if 'password' in config else config
             print(f"Configuration: {safe_config}")
 
             connector = OracleConnector(config)
@@ -1,12 +1,14 @@
 import os
 import sys
-import json
+import csv
 import logging
+import tempfile
 from datetime import datetime
 
 # Add backend directory to path
 sys.path.append(os.path.abspath(os.path.join(os.getcwd(), 'backend')))
 
+from sqlalchemy import delete
 from app.core.import_engine import ReconciliationService, CSVConnector
 from app.db.database import SessionLocal, engine, Base
 from app.db.models import ImportSource, ConfigurationItem, CIType, CIStatus
@@ -14,26 +16,36 @@ from app.db.models import ImportSource, ConfigurationItem, CIType, CIStatus
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# CSV fixture, built once at import
+CSV_HEADER = ("name", "ci_type", "status", "description", "extra_col")
+CSV_ROWS = (
+    ("TEST-CI-RAW", "server", "active", "Test Description", "SomeRawValue"),
+)
+
 def test_csv_import_raw_data():
     # Ensure tables exist
     Base.metadata.create_all(bind=engine)
     
     db = SessionLocal()
     
-    csv_file = "test_import.csv"
-    with open(csv_file, "w") as f:
-        f.write("name,ci_type,status,description,extra_col\n")
-        f.write("TEST-CI-RAW,server,active,Test Description,SomeRawValue\n")
-        
+    # Unique temp file (parallel runs don't collide), removed when the block exits
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", newline="") as tf:
+        writer = csv.writer(tf)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(CSV_ROWS)
+        tf.flush()
+        run_import_check(db, tf.name)
+
+def run_import_check(db, csv_file):
     try:
         # Create Dummy Source
         source = ImportSource(
             name="Test CSV Source",
             source_type="csv",
-            config=json.dumps({
+            config={
                 "file_path": os.path.abspath(csv_file),
                 "field_mapping": {"name": "name"}
-            }),
+            },
             is_active=True
         )
         db.add(source)
@@ -51,8 +63,9 @@ def test_csv_import_raw_data():
         if ci and ci.raw_data:
             print("SUCCESS: Raw Data found!")
             print(f"Raw Data: {ci.raw_data}")
-            raw_json = json.loads(ci.raw_data)
-            if raw_json.get('extra_col') == "SomeRawValue":
+            # raw_data is JSONB (already a dict), one section per source type
+            csv_raw = ci.raw_data.get("csv", {})
+            if csv_raw.get('extra_col') == "SomeRawValue":
                  print("SUCCESS: extra_col captured correctly")
             else:
                  print("FAILURE: extra_col missing")
@@ -66,18 +79,15 @@ def test_csv_import_raw_data():
         import traceback
         traceback.print_exc()
     finally:
-        # Cleanup
-        if 'ci' in locals() and ci:
-            db.delete(ci)
-        if 'source' in locals() and source:
-            try:
-                db.delete(source)
-            except Exception as e:
-                print(f"Cleanup warning: {e}")
-        db.commit()
+        # Cleanup: bulk DELETEs in one transaction (CI first, it references the source)
+        db.rollback()
+        try:
+            with db.begin():
+                db.execute(delete(ConfigurationItem).where(ConfigurationItem.name == "TEST-CI-RAW"))
+                db.execute(delete(ImportSource).where(ImportSource.name == "Test CSV Source"))
+        except Exception as e:
+            print(f"Cleanup warning: {e}")
         db.close()
-        if os.path.exists(csv_file):
-            os.remove(csv_file)
 
 if __name__ == "__main__":
     test_csv_import_raw_data()